@@ -1,20 +1,37 @@
 import asyncio
-from typing import Optional, List, Dict
-from fastapi import HTTPException
+import base64
+import hashlib
+import json
+from typing import Optional, Dict, Set, Tuple
+from fastapi import HTTPException, Response
 from datetime import datetime
 from services.file_storage_service import file_storage
-from services.scheduler_service import scrape_all_jobs, scheduler_service
+from services.scheduler_service import SCRAPERS, scrape_all_jobs, scheduler_service
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Companies that can ever appear in storage; anything else matches nothing
+KNOWN_COMPANIES = frozenset(SCRAPERS)
+
+# Strong references to fire-and-forget tasks (the loop only keeps weak ones),
+# so they can't be garbage-collected mid-run and shutdown can wind them down
+background_tasks: Set[asyncio.Task] = set()
+
+# In-process response cache for get_job_opportunities. Keys embed the
+# storage `cached_at` stamp, so a refresh invalidates every entry implicitly.
+RESPONSE_CACHE_MAX = 256
+_response_cache: Dict[Tuple, Dict] = {}
+
 
 async def get_job_opportunities(
     company: Optional[str] = None,
     location: Optional[str] = None,
     tech_stack: Optional[str] = None,
     limit: Optional[int] = None,
-    offset: int = 0
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    response: Optional[Response] = None
 ) -> Dict:
     """
     Get job opportunities from cache with optional filtering
@@ -24,49 +41,86 @@ async def get_job_opportunities(
         location: Filter by location (case-insensitive partial match)
         tech_stack: Filter by technology (case-insensitive)
         limit: Maximum number of results to return
-        offset: Number of results to skip (for pagination)
+        cursor: Opaque cursor from a previous page's `next_cursor` (for pagination)
+        if_none_match: Value of the request's If-None-Match header
+        response: Outgoing response, used to set the ETag header
 
     Returns:
         Standardized response with jobs and metadata
 
     Raises:
+        HTTPException 304: Client's cached copy (If-None-Match) is still current
+        HTTPException 400: Malformed cursor
         HTTPException 404: No cached jobs available
         HTTPException 503: Cache service unavailable
     """
+    after = decode_cursor(cursor) if cursor else None
+
     try:
-        # Fetch all jobs from file storage
-        cached_jobs = await file_storage.get_all_jobs()
+        # Get metadata
+        metadata = await file_storage.get_metadata()
 
-        if not cached_jobs:
+        if not metadata.get("total_count"):
             raise HTTPException(
                 status_code=404,
                 detail="No jobs available yet. Try refreshing with POST /api/job_opportunities/refresh"
             )
 
-        # Apply filters
-        filtered_jobs = apply_filters(cached_jobs, company, location, tech_stack)
-
-        # Pagination
-        total_filtered = len(filtered_jobs)
-        if limit:
-            paginated_jobs = filtered_jobs[offset:offset + limit]
+        cache_key = (company, location, tech_stack, limit, cursor, metadata.get("cached_at"))
+
+        # The payload only changes when storage is refreshed, so the ETag is
+        # derived from the filter tuple plus `cached_at`
+        etag = '"' + hashlib.blake2s("|".join(map(str, cache_key)).encode()).hexdigest() + '"'
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        if response is not None:
+            response.headers["ETag"] = etag
+        cached_response = _response_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+        # Filter and paginate inside the storage layer (unknown companies
+        # can't match anything, so skip the query entirely)
+        if company and company.lower() not in KNOWN_COMPANIES:
+            paginated_jobs, total_filtered = [], 0
         else:
-            paginated_jobs = filtered_jobs[offset:]
+            paginated_jobs, total_filtered = await file_storage.query_jobs(
+                company, location, tech_stack, limit, after
+            )
 
-        # Get metadata
-        metadata = await file_storage.get_metadata()
-        metadata["filtered_count"] = total_filtered
+        # Per-response metadata: the cached payload must not share (or
+        # write into) the dict storage handed out
+        response_metadata = {
+            **metadata,
+            "filtered_count": total_filtered,
+            "next_cursor": (
+                encode_cursor(file_storage.sort_key(paginated_jobs[-1]))
+                if limit and len(paginated_jobs) == limit else None
+            )
+        }
 
-        logger.info(f"Returning {len(paginated_jobs)}/{total_filtered} jobs (filters: company={company}, location={location}, tech={tech_stack})")
+        # Per-request line: debug level with lazy %-formatting, so nothing is
+        # formatted or written to stdout unless debugging is enabled
+        logger.debug(
+            "Returning %d/%s jobs (filters: company=%s, location=%s, tech=%s)",
+            len(paginated_jobs), total_filtered, company, location, tech_stack
+        )
 
-        return {
+        payload = {
             "status": "success",
             "data": {
                 "jobs": paginated_jobs,
-                "metadata": metadata
+                "metadata": response_metadata
             }
         }
 
+        # Evict the oldest entry once full (dicts keep insertion order)
+        if len(_response_cache) >= RESPONSE_CACHE_MAX:
+            _response_cache.pop(next(iter(_response_cache)))
+        _response_cache[cache_key] = payload
+
+        return payload
+
     except HTTPException:
         raise  # Re-raise HTTP exceptions
     except Exception as e:
@@ -79,28 +133,29 @@ async def get_job_opportunities(
 
 async def refresh_jobs() -> Dict:
     """
-    Trigger manual job refresh in background, return current data immediately
+    Trigger manual job refresh in background, return current metadata immediately
 
     Returns:
-        Current data with refresh_in_progress flag
+        Current metadata with refresh_in_progress flag and available job count
 
-    Note: This returns current data instantly and triggers scraping in background
+    Note: The job list itself is not included; clients fetch it with
+    GET /api/job_opportunities once the refresh has published new data
     """
     try:
-        # Get current data
-        cached_jobs = await file_storage.get_all_jobs()
-        metadata = await file_storage.get_metadata()
-        metadata["refresh_in_progress"] = True
+        # Get current metadata only (no full job list read)
+        metadata = {**await file_storage.get_metadata(), "refresh_in_progress": True}
 
         # Trigger background refresh
-        asyncio.create_task(scrape_all_jobs())
+        task = asyncio.create_task(scrape_all_jobs())
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
         logger.info("Manual refresh triggered in background")
 
         return {
             "status": "success",
-            "message": "Refresh triggered. This may take a few minutes. The data below is from the current storage.",
+            "message": "Refresh triggered. This may take a few minutes. Fetch GET /api/job_opportunities for the current jobs.",
             "data": {
-                "jobs": cached_jobs or [],
+                "jobs_available": metadata.get("total_count", 0),
                 "metadata": metadata
             }
         }
@@ -113,6 +168,13 @@ async def refresh_jobs() -> Dict:
         )
 
 
+async def cancel_background_tasks() -> None:
+    """Cancel in-flight background tasks and wait for their cleanup (e.g. lock release)"""
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+
 async def get_scraping_status() -> Dict:
     """
     Get detailed scraping status for all companies
@@ -126,22 +188,19 @@ async def get_scraping_status() -> Dict:
         # Get scheduler status
         scheduler_status = scheduler_service.get_status()
 
-        # Get company-specific status
-        companies_status = {}
-        company_names = ["posthog", "kraken", "coinbase", "railway", "airbnb"]
-
-        for company in company_names:
-            status = await file_storage.get_scrape_status(company)
-            if status:
-                companies_status[company] = status
-            else:
-                # No status available
-                companies_status[company] = {
-                    "last_scraped": None,
-                    "status": "unknown",
-                    "job_count": 0,
-                    "error": None
-                }
+        # Company-specific statuses live inside the metadata already loaded
+        # above, so read them from there instead of one storage read each;
+        # companies without a status get an "unknown" entry
+        stored_statuses = metadata.get("companies", {})
+        companies_status = {
+            company: stored_statuses.get(company) or {
+                "last_scraped": None,
+                "status": "unknown",
+                "job_count": 0,
+                "error": None
+            }
+            for company in SCRAPERS
+        }
 
         return {
             "status": "success",
@@ -161,42 +220,29 @@ async def get_scraping_status() -> Dict:
         )
 
 
-def apply_filters(
-    jobs: List[Dict],
-    company: Optional[str] = None,
-    location: Optional[str] = None,
-    tech_stack: Optional[str] = None
-) -> List[Dict]:
-    """
-    Apply filters to job list
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header (possibly a list or weak tags) against an ETag"""
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
 
-    Args:
-        jobs: List of job dictionaries
-        company: Company filter
-        location: Location filter (case-insensitive partial match)
-        tech_stack: Technology filter (case-insensitive)
 
-    Returns:
-        Filtered list of jobs
+def encode_cursor(key: Tuple[str, str]) -> str:
+    """Encode a job sort key as an opaque URL-safe pagination cursor"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a pagination cursor back into a job sort key
+
+    Raises:
+        HTTPException 400: Cursor is not one produced by `encode_cursor`
     """
-    filtered = jobs
-
-    # Filter by company
-    if company:
-        company_lower = company.lower()
-        filtered = [j for j in filtered if j.get("company", "").lower() == company_lower]
-
-    # Filter by location (partial match)
-    if location:
-        location_lower = location.lower()
-        filtered = [j for j in filtered if location_lower in j.get("location", "").lower()]
-
-    # Filter by tech stack (searches the unified `skills` field)
-    if tech_stack:
-        tech_lower = tech_stack.lower()
-        filtered = [
-            j for j in filtered
-            if any(tech_lower in s.lower() for s in j.get("skills", []))
-        ]
-
-    return filtered
+    try:
+        posting_date, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (str(posting_date), str(job_id))
+    except Exception:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid pagination cursor."
+        )
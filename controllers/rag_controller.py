@@ -1,28 +1,54 @@
 import os
+import time
+import asyncio
+import hashlib
+from typing import Dict, Optional, Tuple
 from fastapi import HTTPException
 from dotenv import load_dotenv
+from pydantic import ValidationError
+from models.analysis_models import CVAnalysis
+from utils.logger import setup_logger
 import json
+import httpx2
 import anthropic
 
 load_dotenv()
+logger = setup_logger(__name__)
 
-client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+# Resolved once at import; `load_dotenv` above has already populated the env
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
-def extrair_json(texto):
-    start = texto.find('{')
-    end = texto.rfind('}')
-    if start != -1 and end != -1 and end > start:
-        return texto[start:end+1]
-    return texto
+# Inference knobs pinned per deployment: the model tier and the output
+# budget (the ATS JSON is a few hundred tokens; 1024 leaves headroom)
+MODEL = os.getenv("ANALYSIS_MODEL", "claude-haiku-4-5")
+MAX_TOKENS = int(os.getenv("ANALYSIS_MAX_TOKENS", "1024"))
 
-def analyze_job_cv(job_description: str, resume_text: str):
-    if not os.getenv("ANTHROPIC_API_KEY"):
-        raise HTTPException(
-            status_code=500,
-            detail="Internal error: Anthropic API key not configured."
-        )
+# Input budgets in characters (~4 chars per token): prompt size drives
+# prefill latency and cost, so oversized inputs are cut before the call
+MAX_RESUME_CHARS = int(os.getenv("ANALYSIS_MAX_RESUME_CHARS", "24000"))
+MAX_JOB_DESCRIPTION_CHARS = int(os.getenv("ANALYSIS_MAX_JOB_DESCRIPTION_CHARS", "16000"))
+
+# Caps concurrent LLM calls so bursts queue here instead of piling up
+# in-flight requests; waiters give up after LLM_TIMEOUT seconds overall
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT = 300  # seconds
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+# Memoized analyses keyed by a digest of (job description, resume, model);
+# resubmitting the same CV for the same job skips the LLM call entirely
+ANALYSIS_CACHE_MAX = 1024
+ANALYSIS_CACHE_TTL = 3600  # seconds
+analysis_cache: Dict[bytes, Tuple[float, dict]] = {}
+# Analyses currently running, so identical concurrent submissions (frontend
+# retries, double clicks) share one LLM call instead of each starting one
+analysis_inflight: Dict[bytes, asyncio.Task] = {}
 
-    system_message = """You are an ATS (Applicant Tracking System) for analyzing compatibility between job postings and resumes.
+# Shared async client, created per worker at startup (see `open_client`):
+# one pooled HTTP/2 connection set reused by every analysis
+client: Optional[anthropic.AsyncAnthropic] = None
+
+# Static system prompt, built once instead of per request
+SYSTEM_MESSAGE = """You are an ATS (Applicant Tracking System) for analyzing compatibility between job postings and resumes.
 
     TASK:
     Compare the job requirements with the literal content of the resume and return a JSON analysis.
@@ -45,6 +71,168 @@ def analyze_job_cv(job_description: str, resume_text: str):
 
     {"matched_requirements":["matched requirement 1","matched requirement 2"],"missing_requirements":["missing requirement 1"],"score":75,"observation":"objective observation about the candidate profile relative to the job posting"}"""
 
+
+# System prompt as a cacheable block: it is the identical prefix of every
+# request, so marking it lets the API reuse the prefill instead of
+# recomputing it per call (takes effect once the prefix reaches the model's
+# minimum cacheable length)
+SYSTEM_BLOCKS = [
+    {"type": "text", "text": SYSTEM_MESSAGE, "cache_control": {"type": "ephemeral"}}
+]
+
+
+def open_client():
+    """Create the shared Anthropic client on application startup"""
+    global client
+    # The SDK runs on httpx2 and rejects httpx's Timeout, so the timeout is
+    # the SDK's own type and the limits come from httpx2
+    client = anthropic.AsyncAnthropic(
+        api_key=ANTHROPIC_API_KEY,
+        timeout=anthropic.Timeout(300.0, connect=5.0),
+        max_retries=2,
+        http_client=anthropic.DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx2.Limits(max_connections=32, max_keepalive_connections=16)
+        )
+    )
+
+
+async def close_client():
+    """Close the shared Anthropic client on application shutdown"""
+    global client
+    if client is not None:
+        await client.close()
+        client = None
+
+json_decoder = json.JSONDecoder()
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """
+    Cut text to at most max_chars, backing off to the last whitespace
+
+    Args:
+        text: Input text
+        max_chars: Character budget
+
+    Returns:
+        The text unchanged if within budget, otherwise its truncated prefix
+    """
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundary = cut.rfind(" ", max_chars - 200)
+    return cut[:boundary] if boundary > 0 else cut
+
+def extrair_json(texto):
+    """Parse the first JSON object in the text, ignoring anything around it"""
+    start = texto.find('{')
+    if start == -1:
+        raise ValueError("No JSON object found")
+    content, _ = json_decoder.raw_decode(texto, start)
+    return content
+
+async def stream_analysis(user_message: str) -> str:
+    """
+    Run the analysis completion and return its raw text
+
+    Streams the completion and stops reading as soon as a complete JSON
+    object has arrived instead of waiting for any trailing tokens.
+    """
+    if llm_semaphore.locked():
+        logger.warning(f"LLM concurrency limit ({LLM_MAX_CONCURRENCY}) reached, queuing request")
+
+    async with llm_semaphore:
+        started = time.monotonic()
+        chunks = []
+        scanner = JsonObjectScanner()
+        async with client.messages.stream(
+            model=MODEL,
+            max_tokens=MAX_TOKENS,
+            temperature=0.1,
+            system=SYSTEM_BLOCKS,
+            messages=[{"role": "user", "content": user_message}]
+        ) as stream:
+            async for text in stream.text_stream:
+                chunks.append(text)
+                if scanner.feed(text):
+                    break
+
+    logger.debug("LLM analysis took %.2fs", time.monotonic() - started)
+    return "".join(chunks).strip()
+
+class JsonObjectScanner:
+    """
+    Incrementally detect when the first JSON object in a stream is complete
+
+    Tracks brace depth (ignoring braces inside strings) as chunks arrive, so
+    each chunk is scanned once instead of re-parsing the whole buffer.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume a chunk; return True once the first object has closed"""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                # Strings only matter inside the object; prose before it is ignored
+                self.in_string = self.started
+            elif ch == "{":
+                self.started = True
+                self.depth += 1
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+async def analyze_job_cv(job_description: str, resume_text: str):
+    if not ANTHROPIC_API_KEY:
+        raise HTTPException(
+            status_code=500,
+            detail="Internal error: Anthropic API key not configured."
+        )
+
+    original_sizes = (len(job_description), len(resume_text))
+    job_description = truncate_text(job_description, MAX_JOB_DESCRIPTION_CHARS)
+    resume_text = truncate_text(resume_text, MAX_RESUME_CHARS)
+    if (len(job_description), len(resume_text)) != original_sizes:
+        logger.warning(
+            f"Truncated LLM input: job description {original_sizes[0]} -> {len(job_description)} chars, "
+            f"resume {original_sizes[1]} -> {len(resume_text)} chars"
+        )
+
+    cache_key = hashlib.blake2s(
+        "\0".join((job_description, resume_text, MODEL)).encode()
+    ).digest()
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        stored_at, response = cached
+        if time.monotonic() - stored_at < ANALYSIS_CACHE_TTL:
+            return response
+        del analysis_cache[cache_key]
+
+    task = analysis_inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(run_analysis(job_description, resume_text, cache_key))
+        analysis_inflight[cache_key] = task
+        task.add_done_callback(lambda _: analysis_inflight.pop(cache_key, None))
+
+    # Shielded so one caller disconnecting doesn't cancel the shared call
+    return await asyncio.shield(task)
+
+async def run_analysis(job_description: str, resume_text: str, cache_key: bytes):
+    """Run one LLM analysis, validate it and store it in the analysis cache"""
     user_message = f"""JOB DESCRIPTION:
     {job_description}
 
@@ -52,15 +240,7 @@ def analyze_job_cv(job_description: str, resume_text: str):
     {resume_text}"""
 
     try:
-        message = client.messages.create(
-            model="claude-haiku-4-5",
-            max_tokens=1024,  # JSON de ATS nunca precisa de 5000 tokens
-            temperature=0.1,
-            system=system_message,
-            messages=[{"role": "user", "content": user_message}]
-        )
-
-        content_raw = message.content[0].text.strip()
+        content_raw = await asyncio.wait_for(stream_analysis(user_message), timeout=LLM_TIMEOUT)
 
         if not content_raw:
             raise HTTPException(
@@ -68,30 +248,43 @@ def analyze_job_cv(job_description: str, resume_text: str):
                 detail="Unexpected response from external service."
             )
 
+        # Fast path: parse and validate the raw text in one compiled pass
         try:
-            content = json.loads(content_raw)
-        except json.JSONDecodeError:
-            json_puro = extrair_json(content_raw)
+            analysis = CVAnalysis.model_validate_json(content_raw)
+        except ValidationError:
+            # Model wrapped the JSON in extra text, or fields are wrong
             try:
-                content = json.loads(json_puro)
-            except json.JSONDecodeError:
+                content = extrair_json(content_raw)
+            except ValueError:
                 raise HTTPException(
                     status_code=502,
                     detail="External service response is not in valid format."
                 )
+            try:
+                analysis = CVAnalysis.model_validate(content)
+            except ValidationError:
+                raise HTTPException(
+                    status_code=502,
+                    detail="External service response does not contain all required fields."
+                )
 
-        required_keys = {"matched_requirements", "missing_requirements", "score", "observation"}
-        if not isinstance(content, dict) or not all(key in content for key in required_keys):
-            raise HTTPException(
-                status_code=502,
-                detail="External service response does not contain all required fields."
-            )
+        response = {"status": "success", "data": analysis.model_dump()}
 
-        return {"status": "success", "data": content}
+        # Evict the oldest entry once full (dicts keep insertion order)
+        if len(analysis_cache) >= ANALYSIS_CACHE_MAX:
+            analysis_cache.pop(next(iter(analysis_cache)))
+        analysis_cache[cache_key] = (time.monotonic(), response)
+
+        return response
 
     except HTTPException:
         raise
-    except anthropic.APIStatusError:
+    except (anthropic.APITimeoutError, asyncio.TimeoutError):
+        raise HTTPException(
+            status_code=504,
+            detail="External service timed out. Please try again later."
+        )
+    except (anthropic.APIConnectionError, anthropic.APIStatusError):
         raise HTTPException(
             status_code=502,
             detail="Error when querying external service. Please try again later."
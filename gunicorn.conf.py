@@ -0,0 +1,18 @@
+import os
+
+# Production server: gunicorn managing uvicorn workers (`gunicorn -c gunicorn.conf.py main:app`).
+# Each worker runs the FastAPI lifespan itself, so the LLM client is created
+# per process. The scheduler only starts in the worker holding the flock on
+# data/scheduler.lock; when that worker exits, its replacement takes it over.
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, (os.cpu_count() or 1) * 2 + 1)))
+worker_class = "uvicorn.workers.UvicornWorker"
+worker_connections = 1000
+
+# CV analyses wait on the LLM for up to 300s
+timeout = 600
+graceful_timeout = 60
+
+# Import the app once in the master and fork workers from it (copy-on-write)
+preload_app = True
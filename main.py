@@ -1,11 +1,13 @@
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import routes
+from controllers import rag_controller, jobs_controller
 from services.file_storage_service import file_storage
 from services.scheduler_service import scheduler_service
-from utils.logger import setup_logger
+from utils.logger import LOG_SEPARATOR, setup_logger
 
 logger = setup_logger(__name__)
 
@@ -16,26 +18,30 @@ async def lifespan(app: FastAPI):
     Application lifespan manager
 
     Handles startup and shutdown events:
-    - Startup: Initialize file storage, start scheduler
-    - Shutdown: Stop scheduler, close file storage
+    - Startup: Initialize file storage, open LLM client, start scheduler
+    - Shutdown: Stop scheduler and background refreshes, close file storage, close LLM client
     """
     # Startup
-    logger.info("=" * 60)
+    logger.info(LOG_SEPARATOR)
     logger.info("GoApply starting up...")
-    logger.info("=" * 60)
+    logger.info(LOG_SEPARATOR)
 
     try:
         # Initialize file storage
         await file_storage.connect()
         logger.info("[OK] File storage initialized")
 
+        # Open shared LLM client (per process, never inherited across forks)
+        rag_controller.open_client()
+        logger.info("[OK] LLM client opened")
+
         # Start scheduler
         scheduler_service.start()
         logger.info("[OK] Scheduler started")
 
-        logger.info("=" * 60)
+        logger.info(LOG_SEPARATOR)
         logger.info("GoApply is ready!")
-        logger.info("=" * 60)
+        logger.info(LOG_SEPARATOR)
 
     except Exception as e:
         logger.error(f"Startup failed: {e}")
@@ -44,22 +50,30 @@ async def lifespan(app: FastAPI):
     yield  # Application runs here
 
     # Shutdown
-    logger.info("=" * 60)
+    logger.info(LOG_SEPARATOR)
     logger.info("GoApply shutting down...")
-    logger.info("=" * 60)
+    logger.info(LOG_SEPARATOR)
 
     try:
         # Stop scheduler
         scheduler_service.stop()
         logger.info("[OK] Scheduler stopped")
 
+        # Stop manually triggered refreshes so they release the scrape lock
+        await jobs_controller.cancel_background_tasks()
+        logger.info("[OK] Background tasks stopped")
+
         # Close file storage
         await file_storage.disconnect()
         logger.info("[OK] File storage closed")
 
-        logger.info("=" * 60)
+        # Close shared LLM client
+        await rag_controller.close_client()
+        logger.info("[OK] LLM client closed")
+
+        logger.info(LOG_SEPARATOR)
         logger.info("GoApply shut down successfully")
-        logger.info("=" * 60)
+        logger.info(LOG_SEPARATOR)
 
     except Exception as e:
         logger.error(f"Shutdown error: {e}")
@@ -80,4 +94,13 @@ app.add_middleware(
 app.mount('/api', routes.router)
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    # Local runs only; production goes through gunicorn.conf.py. uvloop and
+    # httptools (uvicorn[standard]) are picked up automatically when installed,
+    # and the file-watching reloader is opt-in via RELOAD=1.
+    uvicorn.run(
+        "main:app",
+        host="127.0.0.1",
+        port=8000,
+        reload=os.getenv("RELOAD") == "1",
+        access_log=False,
+    )
\ No newline at end of file
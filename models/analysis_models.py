@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class CVAnalysis(BaseModel):
+    """ATS analysis of a resume against a job posting, as returned by the LLM"""
+    matched_requirements: List[str]
+    missing_requirements: List[str]
+    score: int  # 0-100, rounded
+    observation: str
+
+
+class CVAnalysisResponse(BaseModel):
+    """Response for the resume analysis endpoint"""
+    status: str = "success"
+    data: CVAnalysis
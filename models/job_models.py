@@ -1,50 +1,41 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict
-from datetime import datetime
+
+# Timestamps are typed as the ISO strings storage holds, so responses carry
+# them exactly as stored instead of being re-parsed and re-formatted
 
 class Job(BaseModel):
     """Individual job posting model"""
+    # Records stored before `skills` existed carry `requirements` and
+    # `tech_stack` instead; those pass through as extra fields
+    model_config = ConfigDict(extra="allow")
+
     id: str  # Format: {company}_{sanitized_title}_{hash}
     company: str  # kraken, posthog, coinbase, railway, airbnb
     title: str
-    requirements: List[str]  # Extracted bullet points or key requirements
+    skills: List[str] = []  # Requirements followed by extracted technologies
     location: str
     posting_date: Optional[str] = None  # ISO format or "N days ago" or None
-    tech_stack: List[str] = []  # Extracted technologies
     url: str  # Using str instead of HttpUrl for flexibility
-    scraped_at: datetime
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    scraped_at: str
 
 
 class CompanyMetadata(BaseModel):
     """Metadata for a single company's scraping results"""
     count: int
-    last_scraped: datetime
+    last_scraped: Optional[str] = None
     status: str  # "success", "failed", "pending"
     error: Optional[str] = None
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
 
 class JobsMetadata(BaseModel):
-    """Metadata for entire job collection"""
+    """Metadata for entire job collection, as returned with a page of jobs"""
     total_count: int
     filtered_count: int
-    cached_at: datetime
+    next_cursor: Optional[str] = None  # Cursor for the next page; None on the last one
+    cached_at: str
     companies: Dict[str, CompanyMetadata]
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
 
 class JobsData(BaseModel):
     """Data container for jobs response"""
@@ -58,11 +49,17 @@ class JobsResponse(BaseModel):
     data: JobsData
 
 
+class RefreshData(BaseModel):
+    """Data container for refresh response (metadata only, no job list)"""
+    jobs_available: int
+    metadata: Dict
+
+
 class RefreshResponse(BaseModel):
     """Response for manual refresh endpoint"""
     status: str = "success"
     message: str
-    data: JobsData
+    data: RefreshData
 
 
 class StatusResponse(BaseModel):
@@ -1,12 +1,16 @@
-from fastapi import HTTPException, status, UploadFile, File, Form, FastAPI, Query
+import asyncio
+from fastapi import HTTPException, status, UploadFile, File, Form, FastAPI, Query, Request, Response
 from controllers import rag_controller, jobs_controller
+from services.cv_text_extractor import CVTextExtractor, CVTooLargeError
+from models.analysis_models import CVAnalysisResponse
+from models.job_models import JobsResponse, RefreshResponse, StatusResponse
 from typing import Optional
-import pdfplumber
-import re
 
+# Every route declares a response_model, so FastAPI serializes responses
+# straight to JSON bytes through pydantic-core
 router = FastAPI()
 
-@router.post("/resume")
+@router.post("/resume", response_model=CVAnalysisResponse)
 async def upload_file_endpoint(cv: UploadFile = File(...), opportunity: str = Form(...)):
     """Process the opportunity and CV upload"""
     if not opportunity:
@@ -22,21 +26,25 @@ async def upload_file_endpoint(cv: UploadFile = File(...), opportunity: str = Fo
         )
 
     try:
-        with pdfplumber.open(cv.file) as pdf:
-            contents = "\n".join(
-                page.extract_text() or "" for page in pdf.pages
-            )
-        contents = re.sub(
-            r'(?i)(experiência|experiencia|experience|formação|formacao|education|habilidades|skills|projetos|projects|certificações|certifications)',
-            r'\n### \1\n',
-            contents
-        )
-        response = rag_controller.analyze_job_cv(opportunity, contents)
+        # Duplicate uploads are recognized by content digest and reuse the
+        # text extracted last time
+        file_bytes = await cv.read()
+        digest = CVTextExtractor.digest(file_bytes)
+        contents = CVTextExtractor.get_cached(digest)
+        if contents is None:
+            # PDF parsing is CPU-bound; keep it off the event loop
+            contents = await asyncio.to_thread(CVTextExtractor.extract, file_bytes, digest)
+        response = await rag_controller.analyze_job_cv(opportunity, contents)
         return response
 
     except HTTPException as e:
         # Re-raise already handled errors
         raise e
+    except CVTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="The CV is too large to be analyzed."
+        )
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -44,33 +52,41 @@ async def upload_file_endpoint(cv: UploadFile = File(...), opportunity: str = Fo
         )
 
 
-@router.get("/job_opportunities")
+# exclude_unset: jobs stored before `skills` existed are returned as stored
+@router.get("/job_opportunities", response_model=JobsResponse, response_model_exclude_unset=True)
 async def get_job_opportunities_endpoint(
+    request: Request,
+    response: Response,
     company: Optional[str] = Query(None, description="Filter by company (kraken, posthog, coinbase, railway, airbnb)"),
     location: Optional[str] = Query(None, description="Filter by location (partial match)"),
     tech_stack: Optional[str] = Query(None, description="Filter by technology"),
     limit: Optional[int] = Query(None, description="Maximum number of results", ge=1),
-    offset: int = Query(0, description="Number of results to skip", ge=0)
+    cursor: Optional[str] = Query(None, description="Pagination cursor (metadata.next_cursor of the previous page)")
 ):
     """
     Get job opportunities from cache with optional filtering
 
-    Returns cached job listings from Kraken, PostHog, Coinbase, Railway, and Airbnb
+    Returns cached job listings from Kraken, PostHog, Coinbase, Railway, and Airbnb.
+    Responses carry an ETag; send it back as If-None-Match to get 304 while unchanged.
     """
-    return await jobs_controller.get_job_opportunities(company, location, tech_stack, limit, offset)
+    return await jobs_controller.get_job_opportunities(
+        company, location, tech_stack, limit, cursor,
+        if_none_match=request.headers.get("if-none-match"),
+        response=response
+    )
 
 
-@router.post("/job_opportunities/refresh")
+@router.post("/job_opportunities/refresh", response_model=RefreshResponse)
 async def refresh_jobs_endpoint():
     """
     Manually trigger job scraping refresh
 
-    Returns current cached data immediately and triggers background refresh
+    Returns current metadata immediately and triggers background refresh
     """
     return await jobs_controller.refresh_jobs()
 
 
-@router.get("/job_opportunities/status")
+@router.get("/job_opportunities/status", response_model=StatusResponse)
 async def get_scraping_status_endpoint():
     """
     Get detailed scraping status
@@ -1,4 +1,4 @@
-import asyncio
+import re
 import time
 from typing import List, Dict
 
@@ -7,16 +7,55 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Last "•"-separated segment of a card's text (e.g. "Hybrid • São Paulo, Brazil")
+LOCATION_RE = re.compile(r"•([^•]*)$")
+
 
 class AirbnbScraper(BaseScraper):
     COMPANY_NAME = "airbnb"
     # Brazil location filter returns 0 results — scrape all Engineering positions instead.
     # The listing shows Brazil-specific roles (location text in each card).
-    BASE_URL = "https://careers.airbnb.com/positions/?_departments=engineering"
-
-    async def scrape(self) -> List[Dict]:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_scrape)
+    URL = "https://careers.airbnb.com/positions/?_departments=engineering"
+
+    # Airbnb uses <p><strong>Your Expertise</strong></p> followed by a sibling
+    # <ul>. Walk up to 5 ancestor levels to find LI elements in a sibling container.
+    DETAIL_JS = """
+        function expertise() {
+            var results = [];
+            var headings = document.querySelectorAll('h1,h2,h3,h4,h5,h6,strong,b,p');
+            var found = null;
+            for (var i = 0; i < headings.length; i++) {
+                if (headings[i].textContent.trim().toLowerCase().indexOf('your expertise') !== -1) {
+                    found = headings[i];
+                    break;
+                }
+            }
+            if (!found) return results;
+            var el = found;
+            for (var depth = 0; depth < 5; depth++) {
+                var sib = el.nextElementSibling;
+                while (sib) {
+                    var lis = sib.querySelectorAll('li');
+                    if (lis.length > 0) {
+                        for (var k = 0; k < lis.length; k++) {
+                            var t = lis[k].textContent.trim();
+                            if (t.length > 10) results.push(t);
+                        }
+                        return results;
+                    }
+                    if (sib.tagName === 'LI') {
+                        var t2 = sib.textContent.trim();
+                        if (t2.length > 10) results.push(t2);
+                    }
+                    sib = sib.nextElementSibling;
+                }
+                if (!el.parentElement) break;
+                el = el.parentElement;
+            }
+            return results;
+        }
+        return {requirements: expertise(), description: document.body.innerText.slice(0, arguments[0])};
+    """
 
     def _collect_page_jobs(self, driver) -> list:
         """Return job link data from the currently rendered listing page."""
@@ -24,139 +63,86 @@ class AirbnbScraper(BaseScraper):
             return Array.from(document.querySelectorAll('a[href*="/positions/"]'))
                 .map(function(a) {
                     return {
-                        href: a.href,
+                        url: a.href,
                         title: a.textContent.trim(),
                         parentText: a.parentElement ? a.parentElement.textContent.trim() : ''
                     };
                 })
                 .filter(function(j) {
-                    return j.href &&
-                        j.href.indexOf('?') === -1 &&
-                        j.href.indexOf('#') === -1 &&
+                    return j.url &&
+                        j.url.indexOf('?') === -1 &&
+                        j.url.indexOf('#') === -1 &&
                         j.title.length > 2;
                 });
         """) or []
 
-    def _sync_scrape(self) -> List[Dict]:
-        jobs = []
-        driver = self._create_driver()
-        try:
-            logger.info(f"{self.COMPANY_NAME}: Loading {self.BASE_URL}")
-            driver.get(self.BASE_URL)
-            time.sleep(6)
-
-            seen_hrefs: set = set()
-            page_num = 1
-
-            while page_num <= 10:  # safety cap
-                # Scroll to trigger lazy-load
-                for _ in range(2):
-                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-                    time.sleep(1)
-                driver.execute_script("window.scrollTo(0, 0)")
-                time.sleep(1)
+    def _list_jobs(self, driver) -> List[Dict]:
+        """Walk every listing page (FacetWP pagination) and collect its positions."""
+        time.sleep(6)
 
-                job_data = self._collect_page_jobs(driver)
-                new_jobs = [j for j in job_data if j["href"] not in seen_hrefs]
-                logger.info(f"{self.COMPANY_NAME}: Page {page_num} — {len(job_data)} links, {len(new_jobs)} new")
-
-                for item in new_jobs:
-                    seen_hrefs.add(item["href"])
-                    try:
-                        driver.get(item["href"])
-                        time.sleep(3)
-
-                        # Location from parentText (e.g. "Hybrid • São Paulo, Brazil")
-                        location = "Remote"
-                        parent_text = item.get("parentText", "")
-                        if "•" in parent_text:
-                            parts = parent_text.split("•")
-                            if len(parts) >= 2:
-                                loc = parts[-1].strip()
-                                location = loc or "Remote"
-
-                        # Extract from "Your Expertise" section.
-                        # Airbnb uses <p><strong>Your Expertise</strong></p> followed
-                        # by a sibling <ul>. Walk up to 5 ancestor levels to find LI
-                        # elements in a sibling container.
-                        requirements = driver.execute_script("""
-                            var results = [];
-                            var headings = document.querySelectorAll('h1,h2,h3,h4,h5,h6,strong,b,p');
-                            var found = null;
-                            for (var i = 0; i < headings.length; i++) {
-                                if (headings[i].textContent.trim().toLowerCase().indexOf('your expertise') !== -1) {
-                                    found = headings[i];
-                                    break;
-                                }
-                            }
-                            if (!found) return results;
-                            var el = found;
-                            for (var depth = 0; depth < 5; depth++) {
-                                var sib = el.nextElementSibling;
-                                while (sib) {
-                                    var lis = sib.querySelectorAll('li');
-                                    if (lis.length > 0) {
-                                        for (var k = 0; k < lis.length; k++) {
-                                            var t = lis[k].textContent.trim();
-                                            if (t.length > 10) results.push(t);
-                                        }
-                                        return results;
-                                    }
-                                    if (sib.tagName === 'LI') {
-                                        var t2 = sib.textContent.trim();
-                                        if (t2.length > 10) results.push(t2);
-                                    }
-                                    sib = sib.nextElementSibling;
-                                }
-                                if (!el.parentElement) break;
-                                el = el.parentElement;
-                            }
-                            return results;
-                        """) or []
-
-                        # Full page text for tech_stack (catches tech not in requirements)
-                        description = driver.execute_script(
-                            "return document.body.innerText"
-                        ) or ""
-
-                        job = self.create_job_dict(
-                            title=item["title"],
-                            requirements=requirements[:15],
-                            location=location,
-                            url=item["href"],
-                            description=description,
-                        )
-                        jobs.append(job)
-                        logger.info(f"{self.COMPANY_NAME}: Scraped - {item['title']} ({location}) - {len(requirements)} reqs")
-
-                        # Go back to the listing page
-                        driver.back()
-                        time.sleep(3)
-
-                    except Exception as e:
-                        logger.warning(f"{self.COMPANY_NAME}: Error scraping {item['href']}: {e}")
-                        driver.get(self.BASE_URL)
-                        time.sleep(4)
-                        continue
-
-                # Try to click next page
-                try:
-                    next_btn = driver.execute_script("""
-                        var links = document.querySelectorAll('a.facetwp-page.next');
-                        return links.length > 0 ? links[0] : null;
-                    """)
-                    if not next_btn:
-                        logger.info(f"{self.COMPANY_NAME}: No more pages after page {page_num}")
-                        break
-                    driver.execute_script("arguments[0].click();", next_btn)
-                    time.sleep(4)
-                    page_num += 1
-                except Exception as e:
-                    logger.info(f"{self.COMPANY_NAME}: Pagination ended at page {page_num}: {e}")
-                    break
+        # Walk every listing page first (cheap), then scrape all details in
+        # one batch so the driver pool stays busy across page boundaries
+        seen_hrefs: set = set()
+        listed: List[Dict] = []
+        page_num = 1
 
-        finally:
-            driver.quit()
-            logger.info(f"{self.COMPANY_NAME}: Driver closed. Total: {len(jobs)}")
-
-        return jobs
+        while page_num <= 10:  # safety cap
+            # Scroll to trigger lazy-load
+            for _ in range(2):
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
+                time.sleep(1)
+            driver.execute_script("window.scrollTo(0, 0)")
+            time.sleep(1)
+
+            job_data = self._collect_page_jobs(driver)
+            # Check-and-add per link so a card linked twice on the same
+            # page (title + "apply" anchors) is only listed once
+            new_jobs = []
+            for item in job_data:
+                if item["url"] not in seen_hrefs:
+                    seen_hrefs.add(item["url"])
+                    new_jobs.append(item)
+            logger.info(f"{self.COMPANY_NAME}: Page {page_num} — {len(job_data)} links, {len(new_jobs)} new")
+            listed.extend(new_jobs)
+
+            # Try to click next page
+            try:
+                next_btn = driver.execute_script("""
+                    var links = document.querySelectorAll('a.facetwp-page.next');
+                    return links.length > 0 ? links[0] : null;
+                """)
+                if not next_btn:
+                    logger.info(f"{self.COMPANY_NAME}: No more pages after page {page_num}")
+                    break
+                driver.execute_script("arguments[0].click();", next_btn)
+                time.sleep(4)
+                page_num += 1
+            except Exception as e:
+                logger.info(f"{self.COMPANY_NAME}: Pagination ended at page {page_num}: {e}")
+                break
+
+        return listed
+
+    def _scrape_detail(self, driver, item: Dict) -> Dict:
+        """Scrape one position page into a job dict."""
+        self.open_detail(driver, item["url"])
+
+        # Location from parentText (e.g. "Hybrid • São Paulo, Brazil")
+        match = LOCATION_RE.search(item.get("parentText", ""))
+        location = (match.group(1).strip() if match else "") or "Remote"
+
+        # Requirements from "Your Expertise" plus the full page text for
+        # tech_stack (catches tech not in requirements), in one round-trip
+        data = driver.execute_script(self.DETAIL_JS, self.MAX_DESCRIPTION_CHARS) or {}
+        requirements = data.get("requirements") or []
+        description = data.get("description") or ""
+
+        job = self.create_job_dict(
+            title=item["title"],
+            requirements=requirements[:15],
+            location=location,
+            url=item["url"],
+            description=description,
+        )
+        logger.info(f"{self.COMPANY_NAME}: Scraped - {item['title']} ({location}) - {len(requirements)} reqs")
+        return job
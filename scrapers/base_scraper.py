@@ -1,37 +1,233 @@
 import asyncio
+import os
+import queue
+import random
+import re
 import shutil
 import hashlib
-from abc import ABC, abstractmethod
+import logging
+import threading
+from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 
 from utils.logger import setup_logger
 from services.tech_stack_extractor import TechStackExtractor
 
 logger = setup_logger(__name__)
 
+# Optional long-running browser service (e.g. a selenium/standalone-chrome
+# container). When set, scrapers open sessions on it instead of spawning
+# chromedriver + Chrome for every driver
+SELENIUM_REMOTE_URL = os.getenv("SELENIUM_REMOTE_URL")
+
+# Persistent HTTP session for scrapers that read JSON APIs directly, so
+# retries and repeated scrapes reuse the TCP+TLS connection
+http_session = requests.Session()
+http_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+http_session.mount("http://", http_adapter)
+http_session.mount("https://", http_adapter)
+
+# Runs of anything that isn't a letter or digit (str.isalnum semantics)
+NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=None)
+def company_hasher(company: str):
+    """4-byte BLAKE2b state already fed the "<company>_" prefix; callers copy() it."""
+    return hashlib.blake2b(f"{company}_".encode(), digest_size=4)
+
+
+@lru_cache(maxsize=4096)
+def make_job_id(title: str, company: str) -> str:
+    """Build a stable job id; memoized since retries and reruns repeat titles."""
+    sanitized = NON_ALNUM_RE.sub("_", title.lower()).strip("_")[:50]
+    # 4-byte BLAKE2b yields the 8 hex chars directly (no digest to truncate);
+    # copying the pre-seeded state only hashes the title bytes
+    hasher = company_hasher(company).copy()
+    hasher.update(title.encode())
+    return f"{company}_{sanitized}_{hasher.hexdigest()}"
+
+
+class DriverPool:
+    """
+    Warm Chrome sessions shared by all scrapers of one scrape run
+
+    A driver released by one scraper is handed to the next one that needs a
+    browser instead of launching a new Chrome. Created per run (not kept
+    between daily runs) so idle browsers don't hold memory all day.
+    """
+
+    def __init__(self, max_idle: int = 4):
+        self._idle: queue.SimpleQueue = queue.SimpleQueue()
+        self._max_idle = max_idle
+
+    def acquire(self, factory: Callable[[], webdriver.Chrome]) -> webdriver.Chrome:
+        """Return an idle driver, or one built by factory if none is available"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return factory()
+            try:
+                # Reset state left by the previous scraper (also a liveness check)
+                if hasattr(driver, "execute_cdp_cmd"):
+                    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                else:
+                    driver.delete_all_cookies()
+                driver.get("about:blank")
+                return driver
+            except Exception as e:
+                logger.debug("Discarding dead pooled driver: %s", e)
+                self._quit(driver)
+
+    def release(self, driver: webdriver.Chrome):
+        """Return a driver to the pool, quitting it if the pool is full"""
+        if self._idle.qsize() >= self._max_idle:
+            self._quit(driver)
+        else:
+            self._idle.put(driver)
+
+    def close(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver: webdriver.Chrome):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug("Error quitting driver: %s", e)
+
 
 class BaseScraper(ABC):
     TIMEOUT = 30  # seconds (selenium uses seconds, not ms)
     MAX_RETRIES = 3
+    # Exponential backoff between attempts: base * 2^(attempt-1), capped, plus
+    # up to a second of jitter so scrapers failing together don't retry in lockstep
+    RETRY_BASE_DELAY = 2  # seconds
+    RETRY_MAX_DELAY = 60  # seconds
     COMPANY_NAME = "unknown"
+    URL = ""
+    # Detail pages are spread over a few drivers so their page loads overlap;
+    # tunable per deployment since each extra driver is a full Chrome process
+    DETAIL_CONCURRENCY = int(os.getenv("SCRAPER_DETAIL_CONCURRENCY", "3"))
+    # Process-wide cap on detail pages open at once across all scrapers
+    # (they run in parallel), so concurrent scrapes can't exhaust memory
+    MAX_CONCURRENT_PAGES = int(os.getenv("SCRAPER_MAX_CONCURRENT_PAGES", "6"))
+    page_slots = threading.BoundedSemaphore(MAX_CONCURRENT_PAGES)
+    # Detail pages scraped within this window are reused from the previous
+    # run's results instead of being visited again (postings rarely change)
+    DETAIL_CACHE_TTL = int(os.getenv("SCRAPE_DETAIL_CACHE_TTL", str(3 * 24 * 3600)))  # seconds
+    # Page text kept for tech-stack extraction; cut in the browser so huge
+    # pages aren't serialized over the WebDriver connection in full
+    MAX_DESCRIPTION_CHARS = 20000
+    # Detail pages are read as soon as this element is in the DOM instead of
+    # after a fixed sleep; navigation itself returns at DOMContentLoaded
+    DETAIL_READY_SELECTOR = "h1"
+    DETAIL_READY_TIMEOUT = 10  # seconds
+    # Subresources the scrapers never read (they only need DOM text); blocked
+    # so pages finish loading sooner. Stylesheets stay: innerText depends on layout
+    BLOCKED_URL_PATTERNS = [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*.mp4", "*.webm", "*.mp3",
+        # Analytics/tag beacons: extra requests and main-thread script work
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*segment.io*", "*segment.com/analytics*", "*hotjar.com*", "*facebook.net*",
+        "*clarity.ms*", "*hs-analytics.net*",
+    ]
 
-    def __init__(self):
+    def __init__(
+        self,
+        driver_pool: Optional[DriverPool] = None,
+        detail_cache: Optional[Dict[str, Dict]] = None,
+    ):
         self.tech_extractor = TechStackExtractor()
+        self.driver_pool = driver_pool
+        # Previously scraped jobs keyed by URL (see cached_detail)
+        self.detail_cache = detail_cache or {}
 
-    @abstractmethod
     async def scrape(self) -> List[Dict]:
-        pass
+        # Selenium is blocking; run the whole scrape on an executor thread
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._sync_scrape)
+
+    def _sync_scrape(self) -> List[Dict]:
+        """Default flow: one listing page (URL), then its detail pages"""
+        return self.scrape_listing(self.URL, self._list_jobs, self._scrape_detail)
+
+    def _list_jobs(self, driver: webdriver.Chrome) -> List[Dict]:
+        """Collect listing entries ({url, title, ...}) from the loaded listing page"""
+        raise NotImplementedError
+
+    def _scrape_detail(self, driver: webdriver.Chrome, item: Dict) -> Optional[Dict]:
+        """Scrape one detail page into a job dict (None to skip it)"""
+        raise NotImplementedError
+
+    def _scrape_static(self, item: Dict) -> Optional[Dict]:
+        """
+        Optional browser-free fast path for a detail page
+
+        Tried by scrape_details before a driver is taken; returning None
+        falls back to the browser.
+        """
+        return None
+
+    def scrape_listing(
+        self,
+        url: str,
+        list_jobs: Callable[[webdriver.Chrome], List[Dict]],
+        scrape_one: Callable[[webdriver.Chrome, Dict], Optional[Dict]],
+    ) -> List[Dict]:
+        """
+        Load a listing page, collect its jobs, then scrape their detail pages
+
+        Args:
+            url: Listing page URL
+            list_jobs: Callable(driver) returning listing entries once the page
+                has been requested (it does its own waiting/scrolling/paging)
+            scrape_one: Detail scraper passed on to scrape_details
+
+        Returns:
+            Scraped jobs in listing order
+        """
+        jobs = []
+        driver = self.acquire_driver()
+        try:
+            logger.info(f"{self.COMPANY_NAME}: Navigating to {url}")
+            driver.get(url)
+            job_data = list_jobs(driver)
+            logger.info(f"{self.COMPANY_NAME}: Collected {len(job_data)} unique jobs")
+
+            # The listing driver is done; reuse it for detail pages
+            jobs = self.scrape_details(job_data, scrape_one, driver)
+        finally:
+            self.release_driver(driver)
+            logger.info(f"{self.COMPANY_NAME}: Driver released. Total: {len(jobs)}")
+
+        return jobs
 
     async def scrape_with_retry(self) -> List[Dict]:
         for attempt in range(1, self.MAX_RETRIES + 1):
             try:
                 logger.info(f"{self.COMPANY_NAME}: Starting scrape attempt {attempt}/{self.MAX_RETRIES}")
-                jobs = await self.scrape()
+                jobs = self.dedupe_jobs(await self.scrape())
                 logger.info(f"{self.COMPANY_NAME}: Successfully scraped {len(jobs)} jobs")
                 return jobs
             except Exception as e:
@@ -39,34 +235,318 @@ class BaseScraper(ABC):
                 if attempt == self.MAX_RETRIES:
                     logger.error(f"{self.COMPANY_NAME}: All retries exhausted")
                     raise
-                await asyncio.sleep(5 * attempt)
+                await asyncio.sleep(self.retry_delay(attempt, e))
         return []
 
-    def _create_driver(self) -> webdriver.Chrome:
+    @staticmethod
+    def dedupe_jobs(jobs: List[Dict]) -> List[Dict]:
+        """
+        Drop repeated postings, keeping first-seen order
+
+        A posting is repeated if it has the same id and URL as an earlier one,
+        or the same content fingerprint (see content_fingerprint), which
+        catches one posting listed under several URLs.
+        """
+        seen: set = set()
+        seen_content: set = set()
+        unique_jobs = []
+        for job in jobs:
+            key = (job["id"], job["url"])
+            if key in seen:
+                continue
+            fingerprint = BaseScraper.content_fingerprint(job)
+            if fingerprint is not None:
+                if fingerprint in seen_content:
+                    logger.debug("Dropping near-duplicate posting %s", job["url"])
+                    continue
+                seen_content.add(fingerprint)
+            seen.add(key)
+            unique_jobs.append(job)
+        return unique_jobs
+
+    @staticmethod
+    def content_fingerprint(job: Dict) -> Optional[bytes]:
+        """
+        Digest of a job's company, normalized title, location and skills
+
+        Lowercased with punctuation dropped, so reformatting doesn't make
+        one posting look like two. Digits are kept ("Engineer 1" and
+        "Engineer 2" are different reqs), and every skill counts, not just
+        the first few, so only postings identical in all stored fields but
+        the URL collapse.
+
+        Returns:
+            16-byte digest, or None when there are too few skills to tell
+            apart distinct postings that share a title
+        """
+        skills = job.get("skills") or []
+        if len(skills) < 3:
+            return None
+        parts = [job.get("company") or "", job.get("title") or "", job.get("location") or "", *skills]
+        normalized = "\0".join(NON_ALNUM_RE.sub(" ", p.lower()).strip() for p in parts)
+        return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+    def retry_delay(self, attempt: int, error: Exception) -> float:
+        """
+        Seconds to wait before retrying after a failed attempt
+
+        Rate limiting / unavailability (429, 503) backs off hardest and honours
+        a numeric Retry-After; browser timeouts and crashes wait longer than
+        other errors since the site is likely slow rather than broken.
+
+        Args:
+            attempt: 1-based number of the attempt that failed
+            error: Exception raised by that attempt
+
+        Returns:
+            Delay in seconds
+        """
+        base = self.RETRY_BASE_DELAY
+        response = getattr(error, "response", None)
+        if isinstance(error, requests.HTTPError) and response is not None and response.status_code in (429, 503):
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(self.RETRY_MAX_DELAY, int(retry_after)) + random.random()
+            base = 15
+        elif isinstance(error, (TimeoutException, WebDriverException, requests.Timeout)):
+            base = 5
+        return min(self.RETRY_MAX_DELAY, base * 2 ** (attempt - 1)) + random.random()
+
+    def _create_driver(self) -> webdriver.Remote:
         options = Options()
         options.add_argument("--headless")
+        # Return from get() at DOMContentLoaded instead of the full load event;
+        # callers wait for the elements they actually need
+        options.page_load_strategy = "eager"
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
+        if SELENIUM_REMOTE_URL:
+            # Session on the persistent browser service: no process launch here.
+            # Remote sessions have no CDP channel, so only the prefs above apply
+            return webdriver.Remote(command_executor=SELENIUM_REMOTE_URL, options=options)
+
         # Locate system chromium (Railway apt-installed)
         chromium = shutil.which("chromium-browser") or shutil.which("chromium")
         if chromium:
             options.binary_location = chromium
-        return webdriver.Chrome(options=options)
+        driver = webdriver.Chrome(options=options)
+        # Drop fonts/media (and any image the setting above misses) at the network layer
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_URL_PATTERNS})
+        return driver
 
-    def safe_get_text(self, driver: webdriver.Chrome, selector: str, default: str = "") -> str:
+    def acquire_driver(self) -> webdriver.Chrome:
+        """Take a driver from the shared pool, or launch one when there is no pool"""
+        if self.driver_pool is None:
+            return self._create_driver()
+        return self.driver_pool.acquire(self._create_driver)
+
+    def release_driver(self, driver: webdriver.Chrome):
+        """Hand a driver back to the shared pool, or quit it when there is no pool"""
+        if self.driver_pool is None:
+            driver.quit()
+        else:
+            self.driver_pool.release(driver)
+
+    def cached_detail(self, item: Dict) -> Optional[Dict]:
+        """
+        Return the previous run's job for a listing entry if it is still fresh
+
+        Args:
+            item: Listing entry with "url" (and "title" when the listing has one)
+
+        Returns:
+            A copy of the cached job, or None if absent, stale or retitled
+        """
+        job = self.detail_cache.get(item["url"])
+        if job is None or item.get("title", job["title"]) != job["title"]:
+            return None
+        scraped_at = job.get("scraped_at")
         try:
-            el = driver.find_element(By.CSS_SELECTOR, selector)
-            return el.text.strip() or default
-        except Exception:
-            return default
+            if isinstance(scraped_at, str):
+                scraped_at = datetime.fromisoformat(scraped_at)
+            age = (datetime.now() - scraped_at).total_seconds()
+        except (TypeError, ValueError):
+            return None
+        return dict(job) if age < self.DETAIL_CACHE_TTL else None
+
+    def scrape_details(
+        self,
+        items: List[Dict],
+        scrape_one: Callable[[webdriver.Chrome, Dict], Optional[Dict]],
+        driver: Optional[webdriver.Chrome] = None,
+    ) -> List[Dict]:
+        """
+        Visit job detail pages concurrently over a bounded pool of drivers
+
+        Args:
+            items: Listing entries, each with at least a "url" key
+            scrape_one: Callable(driver, item) returning a job dict or None to skip
+            driver: Caller-owned driver (e.g. the one that loaded the listing)
+                to reuse as the first worker instead of launching another;
+                it is left open for the caller to quit
+
+        Returns:
+            Jobs in listing order; items that raise are logged and skipped
+        """
+        if not items:
+            return []
+
+        # Fresh results from the previous run are reused without a browser
+        cached = {}
+        for item in items:
+            job = self.cached_detail(item)
+            if job is not None:
+                cached[item["url"]] = job
+        if cached:
+            logger.info(f"{self.COMPANY_NAME}: Reusing {len(cached)}/{len(items)} cached detail pages")
+        pending = [item for item in items if item["url"] not in cached]
+        if not pending:
+            return list(cached.values())
+
+        # Drivers are created lazily and handed between workers, so at most
+        # DETAIL_CONCURRENCY browsers exist no matter how many items there are
+        idle: queue.SimpleQueue = queue.SimpleQueue()
+        created: List[webdriver.Chrome] = []
+        if driver is not None:
+            idle.put(driver)
+
+        def run(item: Dict) -> Optional[Dict]:
+            try:
+                job = self._scrape_static(item)
+            except Exception as e:
+                logger.debug("%s: Static fetch failed for %s: %s", self.COMPANY_NAME, item.get("url"), e)
+                job = None
+            if job is not None:
+                return job
+
+            with self.page_slots:
+                try:
+                    driver = idle.get_nowait()
+                except queue.Empty:
+                    driver = self.acquire_driver()
+                    created.append(driver)
+                try:
+                    return scrape_one(driver, item)
+                except WebDriverException as e:
+                    # The browser died or is stuck (crashed tab, renderer
+                    # hang, timeout); don't hand it to the next item or back
+                    # to the pool; a fresh one is launched (or taken from the
+                    # pool) instead
+                    logger.warning(f"{self.COMPANY_NAME}: Retiring driver after error at {item.get('url')}: {e}")
+                    if driver in created:
+                        created.remove(driver)
+                        DriverPool._quit(driver)
+                    driver = None
+                    return None
+                except Exception as e:
+                    logger.warning(f"{self.COMPANY_NAME}: Error scraping {item.get('url')}: {e}")
+                    return None
+                finally:
+                    if driver is not None:
+                        idle.put(driver)
+
+        workers = min(self.DETAIL_CONCURRENCY, len(pending))
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.COMPANY_NAME}-detail") as pool:
+                scraped = dict(zip((item["url"] for item in pending), pool.map(run, pending)))
+        finally:
+            for driver in created:
+                self.release_driver(driver)
+
+        results = (cached.get(item["url"]) or scraped.get(item["url"]) for item in items)
+        return [job for job in results if job]
+
+    def collect_links(self, driver: webdriver.Chrome, selector: str) -> List[Dict]:
+        """
+        Read every matching anchor's URL and visible text in one round-trip
+
+        Args:
+            driver: Driver on the listing page
+            selector: CSS selector for the job anchors
+
+        Returns:
+            List of {"url", "title"} dicts in document order
+        """
+        return driver.execute_script("""
+            return Array.from(document.querySelectorAll(arguments[0])).map(function(a) {
+                return {url: a.href || '', title: (a.innerText || '').trim()};
+            });
+        """, selector) or []
+
+    def wait_for(self, driver: webdriver.Chrome, selector: str, min_count: int = 1, timeout: float = None) -> bool:
+        """
+        Wait until at least min_count elements match selector
+
+        Args:
+            driver: Driver on the page being loaded
+            selector: CSS selector to watch for
+            min_count: Number of matches required
+            timeout: Seconds to wait (defaults to DETAIL_READY_TIMEOUT)
+
+        Returns:
+            True once the elements are present, False on timeout
+        """
+        try:
+            WebDriverWait(driver, timeout or self.DETAIL_READY_TIMEOUT).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, selector)) >= min_count
+            )
+            return True
+        except TimeoutException:
+            # current_url is a WebDriver round-trip; skip it unless DEBUG is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s: %r not found at %s", self.COMPANY_NAME, selector, driver.current_url)
+            return False
+
+    def open_detail(self, driver: webdriver.Chrome, url: str) -> bool:
+        """
+        Navigate to a detail page and wait until it is ready to read
+
+        Args:
+            driver: Driver to navigate
+            url: Detail page URL
+
+        Returns:
+            False if DETAIL_READY_SELECTOR never appeared (the page is still
+            read as-is), True otherwise
+        """
+        driver.get(url)
+        return self.wait_for(driver, self.DETAIL_READY_SELECTOR)
+
+    def get_fields(self, driver: webdriver.Chrome, fields: Dict[str, str]) -> Dict[str, str]:
+        """
+        Read the text of several selectors in one round-trip
+
+        Args:
+            driver: Driver on the page to read
+            fields: Mapping of field name to CSS selector
+
+        Returns:
+            Mapping of field name to the first match's visible text ("" on a miss)
+        """
+        try:
+            return driver.execute_script("""
+                var fields = arguments[0], out = {};
+                for (var key in fields) {
+                    var el = document.querySelector(fields[key]);
+                    out[key] = el ? (el.innerText || '').trim() : '';
+                }
+                return out;
+            """, fields) or {}
+        except Exception as e:
+            logger.debug("%s: get_fields failed: %s", self.COMPANY_NAME, e)
+            return {}
+
+    def safe_get_text(self, driver: webdriver.Chrome, selector: str, default: str = "") -> str:
+        return self.get_fields(driver, {"text": selector}).get("text") or default
 
     def generate_job_id(self, title: str, company: str) -> str:
-        sanitized = "".join(c.lower() if c.isalnum() else "_" for c in title)
-        sanitized = "_".join(filter(None, sanitized.split("_")))[:50]
-        hash_short = hashlib.md5(f"{company}_{title}".encode()).hexdigest()[:8]
-        return f"{company}_{sanitized}_{hash_short}"
+        return make_job_id(title, company)
 
     def extract_tech_stack(self, text: str) -> List[str]:
         return self.tech_extractor.extract(text)
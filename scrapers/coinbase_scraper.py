@@ -1,11 +1,9 @@
-import asyncio
 import html
 import re
 from typing import List, Dict
 
-import requests
-
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, http_session
+from scrapers.html_utils import HEADING_RE, LI_RE, SECTION_SPLIT_RE, html_to_text, strip_tags
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -16,14 +14,21 @@ class CoinbaseScraper(BaseScraper):
     # Greenhouse public API — no Selenium needed, no bot detection
     GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards/coinbase/jobs?content=true"
 
-    async def scrape(self) -> List[Dict]:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_scrape)
+    # Requirement-like section headings, matched in one pass instead of a
+    # substring test per keyword
+    REQ_KEYWORDS = [
+        "what you'll do", "what you will do",
+        "what you bring", "what you'll bring",
+        "requirements", "qualifications",
+        "minimum qualifications", "what we look for",
+        "you have", "you will",
+    ]
+    REQ_HEADING_RE = re.compile("|".join(map(re.escape, REQ_KEYWORDS)))
 
     def _sync_scrape(self) -> List[Dict]:
         logger.info(f"{self.COMPANY_NAME}: Fetching jobs from Greenhouse API")
         try:
-            response = requests.get(self.GREENHOUSE_API, timeout=30)
+            response = http_session.get(self.GREENHOUSE_API, timeout=30)
             response.raise_for_status()
             all_jobs_raw = response.json().get("jobs", [])
         except Exception as e:
@@ -32,12 +37,21 @@ class CoinbaseScraper(BaseScraper):
 
         logger.info(f"{self.COMPANY_NAME}: Total jobs from API: {len(all_jobs_raw)}")
 
-        # Filter: Engineering department + Brazil office
-        eng_brazil = [
-            j for j in all_jobs_raw
-            if any("Engineering" in d.get("name", "") for d in j.get("departments", []))
-            and any("Brazil" in o.get("name", "") for o in j.get("offices", []))
-        ]
+        # Filter: Engineering department + Brazil office, dropping repeated
+        # postings (same URL) before paying for HTML parsing + tech extraction
+        eng_brazil = []
+        seen_urls: set = set()
+        for j in all_jobs_raw:
+            if not (
+                any("Engineering" in d.get("name", "") for d in j.get("departments", []))
+                and any("Brazil" in o.get("name", "") for o in j.get("offices", []))
+            ):
+                continue
+            url = j.get("absolute_url") or j.get("id")
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            eng_brazil.append(j)
 
         logger.info(f"{self.COMPANY_NAME}: Engineering + Brazil jobs: {len(eng_brazil)}")
 
@@ -53,8 +67,7 @@ class CoinbaseScraper(BaseScraper):
                 requirements = self._extract_requirements(content_html)
 
                 # Strip all HTML tags for full-text tech_stack extraction
-                description = re.sub(r"<[^>]+>", " ", content_html)
-                description = re.sub(r"\s+", " ", description).strip()
+                description = html_to_text(content_html)[:self.MAX_DESCRIPTION_CHARS]
 
                 job = self.create_job_dict(
                     title=title,
@@ -75,30 +88,18 @@ class CoinbaseScraper(BaseScraper):
 
     def _extract_requirements(self, content_html: str) -> List[str]:
         """Extract requirement bullet points from Greenhouse HTML job content."""
-        # Strip tags helper
-        def strip_tags(s: str) -> str:
-            return re.sub(r"<[^>]+>", " ", s).strip()
-
         results = []
-        # Look for sections with requirement-like headings
-        req_keywords = [
-            "what you'll do", "what you will do",
-            "what you bring", "what you'll bring",
-            "requirements", "qualifications",
-            "minimum qualifications", "what we look for",
-            "you have", "you will",
-        ]
 
         # Split content into sections by headings
         # Find <li> elements within relevant sections
-        sections = re.split(r"(?=<(?:h[1-6]|strong|b)\b)", content_html, flags=re.IGNORECASE)
+        sections = SECTION_SPLIT_RE.split(content_html)
         for section in sections:
-            heading_match = re.match(r"<(?:h[1-6]|strong|b)[^>]*>(.*?)</(?:h[1-6]|strong|b)>", section, re.IGNORECASE | re.DOTALL)
+            heading_match = HEADING_RE.match(section)
             if heading_match:
                 heading_text = strip_tags(heading_match.group(1)).lower()
-                if any(kw in heading_text for kw in req_keywords):
+                if self.REQ_HEADING_RE.search(heading_text):
                     # Extract all <li> items in this section
-                    lis = re.findall(r"<li[^>]*>(.*?)</li>", section, re.IGNORECASE | re.DOTALL)
+                    lis = LI_RE.findall(section)
                     for li in lis:
                         text = strip_tags(li)
                         if len(text) > 10:
@@ -106,7 +107,7 @@ class CoinbaseScraper(BaseScraper):
 
         # Fallback: grab all <li> items if nothing found
         if not results:
-            lis = re.findall(r"<li[^>]*>(.*?)</li>", content_html, re.IGNORECASE | re.DOTALL)
+            lis = LI_RE.findall(content_html)
             for li in lis:
                 text = strip_tags(li)
                 if len(text) > 10:
@@ -0,0 +1,28 @@
+import html
+import re
+
+# Compiled once at import; scrapers that read job HTML from JSON APIs run
+# them over every posting
+TAG_RE = re.compile(r"<[^>]+>")
+WHITESPACE_RE = re.compile(r"\s+")
+SECTION_SPLIT_RE = re.compile(r"(?=<(?:h[1-6]|strong|b)\b)", re.IGNORECASE)
+HEADING_RE = re.compile(r"<(?:h[1-6]|strong|b)[^>]*>(.*?)</(?:h[1-6]|strong|b)>", re.IGNORECASE | re.DOTALL)
+LI_RE = re.compile(r"<li\b[^>]*>(.*?)</li>", re.IGNORECASE | re.DOTALL)
+# Elements whose content is never page text
+NON_TEXT_RE = re.compile(r"<(script|style|noscript)\b.*?</\1>", re.IGNORECASE | re.DOTALL)
+
+
+def strip_tags(fragment: str) -> str:
+    """
+    Drop tags from an HTML fragment, decode entities and collapse whitespace
+
+    Entities are decoded after the tags are gone, so an escaped `&lt;b&gt;`
+    stays text instead of being stripped as a tag. Whitespace is collapsed
+    to single spaces, matching the element text Selenium returns.
+    """
+    return WHITESPACE_RE.sub(" ", html.unescape(TAG_RE.sub(" ", fragment))).strip()
+
+
+def html_to_text(content_html: str) -> str:
+    """Flatten an HTML document to single-spaced plain text with entities decoded"""
+    return strip_tags(content_html)
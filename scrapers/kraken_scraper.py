@@ -1,102 +1,229 @@
-import asyncio
-import time
-from typing import List, Dict
+import re
+from typing import List, Dict, Optional
 
-from selenium.webdriver.common.by import By
-
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, http_session
+from scrapers.html_utils import HEADING_RE, SECTION_SPLIT_RE, strip_tags
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Requirement items under a section heading (bullets or paragraphs)
+ITEM_RE = re.compile(r"<(li|p)\b[^>]*>(.*?)</\1>", re.IGNORECASE | re.DOTALL)
+REQ_HEADING_RE = re.compile(r"the opportunity|skills you should hodl")
+
 
 class KrakenScraper(BaseScraper):
     COMPANY_NAME = "kraken"
     URL = "https://jobs.ashbyhq.com/kraken.com?departmentId=5f67bd79-103b-4ac1-8d79-952b45ea47c9&employmentType=FullTime&locationId=0ae979f7-78d9-4e42-8cf1-831610586017"
 
-    async def scrape(self) -> List[Dict]:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_scrape)
+    # The board SPA is fed by this public GraphQL endpoint; querying it lists
+    # every posting in one request instead of rendering the page in Chrome.
+    # The filters mirror URL's query parameters
+    ASHBY_API = "https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobBoardWithTeams"
+    BOARD_NAME = "kraken.com"
+    DEPARTMENT_ID = "5f67bd79-103b-4ac1-8d79-952b45ea47c9"
+    LOCATION_ID = "0ae979f7-78d9-4e42-8cf1-831610586017"
+    EMPLOYMENT_TYPE = "FullTime"
+    # Browser fallback extractor for a detail page
+    DETAIL_JS = """
+        const loc = document.querySelector('[class*="location"], [data-testid*="location"]');
+        const posted = document.querySelector('time[datetime]');
+        const results = [];
+        const headings = document.querySelectorAll('h1,h2,h3,h4,h5,h6');
+        for (const h of headings) {
+            const t = h.textContent.trim().toLowerCase();
+            if (!t.includes('the opportunity') && !t.includes('skills you should hodl')) continue;
+            const next = h.nextElementSibling || h.parentElement.nextElementSibling;
+            if (!next) continue;
+            const items = next.querySelectorAll('li, p');
+            for (const item of items) {
+                const text = item.textContent.trim();
+                if (text.length > 10) results.push(text);
+            }
+        }
+        return {
+            location: loc ? (loc.innerText || '').trim() : '',
+            posting_date: posted ? posted.getAttribute('datetime').slice(0, 10) : '',
+            requirements: results
+        };
+    """
+
+    # Public posting API: full description HTML for every listed job in one
+    # call, so detail pages don't need a browser at all
+    POSTING_API = "https://api.ashbyhq.com/posting-api/job-board/kraken.com"
+    JOB_BOARD_QUERY = """
+        query ApiJobBoardWithTeams($organizationHostedJobsPageName: String!) {
+            jobBoard: jobBoardWithTeams(organizationHostedJobsPageName: $organizationHostedJobsPageName) {
+                teams { id parentTeamId }
+                jobPostings {
+                    id title teamId locationId locationName employmentType
+                    secondaryLocations { locationId }
+                }
+            }
+        }
+    """
 
     def _sync_scrape(self) -> List[Dict]:
-        jobs = []
-        driver = self._create_driver()
-        try:
-            logger.info(f"{self.COMPANY_NAME}: Navigating to {self.URL}")
-            driver.get(self.URL)
-            time.sleep(3)
-            logger.info(f"{self.COMPANY_NAME}: Page loaded")
-
-            # Collect all job links
-            links = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/kraken.com/"]')
-            logger.info(f"{self.COMPANY_NAME}: Found {len(links)} job links")
-
-            job_data = []
-            for link in links:
-                try:
-                    href = link.get_attribute("href") or ""
-                    if not href:
-                        continue
-                    title = link.text.strip()
-                    if not title or href in [j["url"] for j in job_data]:
-                        continue
-                    job_data.append({"url": href, "title": title})
-                except Exception as e:
-                    logger.debug(f"{self.COMPANY_NAME}: Error reading link: {e}")
-                    continue
-
-            logger.info(f"{self.COMPANY_NAME}: Collected {len(job_data)} unique jobs")
-
-            for job_info in job_data:
-                try:
-                    driver.get(job_info["url"])
-                    time.sleep(2)
-
-                    location = self.safe_get_text(
-                        driver, '[class*="location"], [data-testid*="location"]', "Remote"
-                    )
-
-                    # Extract from "The opportunity" and "Skills you should HODL" sections
-                    requirements = driver.execute_script("""
-                        const results = [];
-                        const headings = document.querySelectorAll('h1,h2,h3,h4,h5,h6');
-                        for (const h of headings) {
-                            const t = h.textContent.trim().toLowerCase();
-                            if (!t.includes('the opportunity') && !t.includes('skills you should hodl')) continue;
-                            const next = h.nextElementSibling || h.parentElement.nextElementSibling;
-                            if (!next) continue;
-                            const items = next.querySelectorAll('li, p');
-                            for (const item of items) {
-                                const text = item.textContent.trim();
-                                if (text.length > 10) results.push(text);
-                            }
-                        }
-                        return results;
-                    """)
-
-                    # Deduplicate while preserving order (JS double-collects when
-                    # both target headings share the same parent container)
-                    seen_reqs: set = set()
-                    unique_reqs = [
-                        r for r in (requirements or [])
-                        if not (r in seen_reqs or seen_reqs.add(r))
-                    ]
-
-                    job = self.create_job_dict(
-                        title=job_info["title"],
-                        requirements=unique_reqs[:15],
-                        location=location,
-                        url=job_info["url"],
-                    )
-                    jobs.append(job)
-                    logger.info(f"{self.COMPANY_NAME}: Scraped job - {job_info['title']} ({location}) - {len(requirements or [])} requirements")
-
-                except Exception as e:
-                    logger.warning(f"{self.COMPANY_NAME}: Error scraping {job_info['url']}: {e}")
-                    continue
-
-        finally:
-            driver.quit()
-            logger.info(f"{self.COMPANY_NAME}: Driver closed")
-
+        job_data = self._list_jobs_from_api()
+        if job_data is None:
+            return super()._sync_scrape()
+
+        # Build jobs straight from the posting API's HTML; only postings it
+        # doesn't cover fall back to the browser
+        descriptions = self._fetch_descriptions()
+        jobs, pending = [], []
+        for job_info in job_data:
+            posting = descriptions.get(job_info["id"])
+            job = self._job_from_posting(job_info, posting) if posting else None
+            if job:
+                jobs.append(job)
+            else:
+                pending.append(job_info)
+        if pending:
+            logger.info(f"{self.COMPANY_NAME}: {len(pending)} postings need the browser")
+            jobs.extend(self.scrape_details(pending, self._scrape_detail))
         return jobs
+
+    def _fetch_descriptions(self) -> Dict[str, Dict]:
+        """Return posting-API jobs keyed by posting id ({} if the call fails)"""
+        try:
+            response = http_session.get(self.POSTING_API, timeout=self.TIMEOUT)
+            response.raise_for_status()
+            return {job["id"]: job for job in response.json().get("jobs", []) if job.get("id")}
+        except Exception as e:
+            logger.warning(f"{self.COMPANY_NAME}: Ashby posting API failed ({e})")
+            return {}
+
+    def _job_from_posting(self, job_info: Dict, posting: Dict) -> Optional[Dict]:
+        """Build a job from posting-API HTML (None if it has no description)"""
+        content_html = posting.get("descriptionHtml") or ""
+        if not content_html:
+            return None
+
+        # Same sections the browser path reads: "The opportunity" and
+        # "Skills you should HODL", deduplicated in order
+        requirements: List[str] = []
+        seen_reqs: set = set()
+        for section in SECTION_SPLIT_RE.split(content_html):
+            heading_match = HEADING_RE.match(section)
+            if not heading_match or not REQ_HEADING_RE.search(strip_tags(heading_match.group(1)).lower()):
+                continue
+            for _, item in ITEM_RE.findall(section[heading_match.end():]):
+                text = strip_tags(item)
+                if len(text) > 10 and text not in seen_reqs:
+                    seen_reqs.add(text)
+                    requirements.append(text)
+
+        job = self.create_job_dict(
+            title=job_info["title"],
+            requirements=requirements[:15],
+            location=job_info["location"],
+            url=job_info["url"],
+            # No description: tech is extracted from the requirements, as
+            # on the browser path, so both paths agree on a job's skills
+            posting_date=(posting.get("publishedAt") or "")[:10] or None,
+        )
+        logger.info(f"{self.COMPANY_NAME}: Scraped job - {job_info['title']} ({job_info['location']}) - {len(requirements)} requirements")
+        return job
+
+    def _list_jobs_from_api(self) -> Optional[List[Dict]]:
+        """
+        List matching postings through Ashby's job board API
+
+        Returns:
+            Listing entries ({id, url, title, location}), or None if the API call
+            failed and the browser listing should be used instead
+        """
+        try:
+            response = http_session.post(
+                self.ASHBY_API,
+                json={
+                    "operationName": "ApiJobBoardWithTeams",
+                    "variables": {"organizationHostedJobsPageName": self.BOARD_NAME},
+                    "query": self.JOB_BOARD_QUERY,
+                },
+                timeout=self.TIMEOUT,
+            )
+            response.raise_for_status()
+            board = response.json()["data"]["jobBoard"]
+        except Exception as e:
+            logger.warning(f"{self.COMPANY_NAME}: Ashby API listing failed ({e}), falling back to browser")
+            return None
+
+        # The department filter covers its sub-teams too
+        children: Dict[str, List[str]] = {}
+        for team in board.get("teams") or []:
+            children.setdefault(team.get("parentTeamId"), []).append(team["id"])
+        team_ids = set()
+        stack = [self.DEPARTMENT_ID]
+        while stack:
+            team_id = stack.pop()
+            if team_id not in team_ids:
+                team_ids.add(team_id)
+                stack.extend(children.get(team_id, []))
+
+        job_data = []
+        for posting in board.get("jobPostings") or []:
+            location_ids = {posting.get("locationId")} | {
+                loc.get("locationId") for loc in posting.get("secondaryLocations") or []
+            }
+            if (
+                posting.get("teamId") not in team_ids
+                or self.LOCATION_ID not in location_ids
+                or posting.get("employmentType") != self.EMPLOYMENT_TYPE
+            ):
+                continue
+            job_data.append({
+                "id": posting["id"],
+                "url": f"https://jobs.ashbyhq.com/{self.BOARD_NAME}/{posting['id']}",
+                "title": posting["title"].strip(),
+                "location": posting.get("locationName") or "Remote",
+            })
+
+        logger.info(f"{self.COMPANY_NAME}: Ashby API listed {len(job_data)} matching jobs")
+        return job_data
+
+    def _list_jobs(self, driver) -> List[Dict]:
+        """Browser fallback: collect job links from the rendered board."""
+        self.wait_for(driver, 'a[href*="/kraken.com/"]')
+
+        links = self.collect_links(driver, 'a[href*="/kraken.com/"]')
+        logger.info(f"{self.COMPANY_NAME}: Found {len(links)} job links")
+
+        job_data = []
+        seen_urls: set = set()
+        for link in links:
+            href, title = link["url"], link["title"]
+            if not href or not title or href in seen_urls:
+                continue
+            seen_urls.add(href)
+            job_data.append({"url": href, "title": title})
+        return job_data
+
+    def _scrape_detail(self, driver, job_info: Dict) -> Dict:
+        """Scrape one Ashby job page into a job dict."""
+        self.open_detail(driver, job_info["url"])
+
+        # Location, posting date and "The opportunity" / "Skills you should
+        # HODL" sections in one round-trip
+        data = driver.execute_script(self.DETAIL_JS) or {}
+        location = job_info.get("location") or data.get("location") or "Remote"
+        requirements = data.get("requirements")
+
+        # Deduplicate while preserving order (JS double-collects when
+        # both target headings share the same parent container)
+        seen_reqs: set = set()
+        unique_reqs = [
+            r for r in (requirements or [])
+            if not (r in seen_reqs or seen_reqs.add(r))
+        ]
+
+        job = self.create_job_dict(
+            title=job_info["title"],
+            requirements=unique_reqs[:15],
+            location=location,
+            url=job_info["url"],
+            posting_date=data.get("posting_date") or None,
+        )
+        logger.info(f"{self.COMPANY_NAME}: Scraped job - {job_info['title']} ({location}) - {len(requirements or [])} requirements")
+        return job
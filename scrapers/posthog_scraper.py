@@ -1,14 +1,17 @@
-import asyncio
+import re
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from selenium.webdriver.common.by import By
 
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, http_session
+from scrapers.html_utils import LI_RE, NON_TEXT_RE, html_to_text, strip_tags
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+H1_RE = re.compile(r"<h1\b[^>]*>(.*?)</h1>", re.IGNORECASE | re.DOTALL)
+
 
 class PostHogScraper(BaseScraper):
     COMPANY_NAME = "posthog"
@@ -16,90 +19,53 @@ class PostHogScraper(BaseScraper):
     # XPath to the main roles <ul> — confirmed by user
     ROLES_UL_XPATH = '//*[@id="roles"]/div[1]/div/div[1]/div/div[2]/div/div/div/div/div[1]/ul'
 
-    async def scrape(self) -> List[Dict]:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_scrape)
-
-    def _sync_scrape(self) -> List[Dict]:
-        jobs = []
-        driver = self._create_driver()
-        try:
-            logger.info(f"{self.COMPANY_NAME}: Navigating to {self.URL}")
-            driver.get(self.URL)
-            time.sleep(5)
-
-            # Scroll to ensure all roles load (Next.js lazy rendering)
-            for _ in range(4):
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(1)
-            driver.execute_script("window.scrollTo(0, 0)")
+    # Title (h1), requirements from ul li and the page text, in one round-trip
+    DETAIL_JS = """
+        var h1 = document.querySelector('h1');
+        var requirements = [];
+        var items = document.querySelectorAll('ul li');
+        for (var i = 0; i < items.length; i++) {
+            var t = items[i].textContent.trim();
+            if (t.length > 10) requirements.push(t);
+            if (requirements.length >= 20) break;
+        }
+        return {
+            title: h1 ? (h1.innerText || '').trim() : '',
+            requirements: requirements,
+            description: document.body.innerText.slice(0, arguments[0])
+        };
+    """
+
+    def _list_jobs(self, driver) -> List[Dict]:
+        """Scroll the careers page until every role renders, then read the links."""
+        time.sleep(5)
+
+        # Scroll to ensure all roles load (Next.js lazy rendering)
+        for _ in range(4):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
             time.sleep(1)
+        driver.execute_script("window.scrollTo(0, 0)")
+        time.sleep(1)
 
-            # Collect all "Read more" hrefs from the roles ul via XPath
-            job_links = self._collect_job_links(driver)
-            logger.info(f"{self.COMPANY_NAME}: Found {len(job_links)} job links")
-
-            for href in job_links:
-                try:
-                    driver.get(href)
-                    time.sleep(2)
-
-                    # Title from h1
-                    try:
-                        title = driver.find_element(By.CSS_SELECTOR, "h1").text.strip()
-                    except Exception:
-                        title = ""
-
-                    if not title:
-                        logger.info(f"{self.COMPANY_NAME}: No h1 found at {href}, skipping")
-                        continue
-
-                    # Requirements from ul li on the detail page
-                    requirements = driver.execute_script("""
-                        var results = [];
-                        var items = document.querySelectorAll('ul li');
-                        for (var i = 0; i < items.length; i++) {
-                            var t = items[i].textContent.trim();
-                            if (t.length > 10) results.push(t);
-                            if (results.length >= 20) break;
-                        }
-                        return results;
-                    """) or []
-
-                    # Full page text for tech_stack extraction
-                    description = driver.execute_script(
-                        "return document.body.innerText"
-                    ) or ""
-
-                    job = self.create_job_dict(
-                        title=title,
-                        requirements=requirements[:15],
-                        location="Remote",
-                        url=href,
-                        description=description,
-                    )
-                    jobs.append(job)
-                    logger.info(f"{self.COMPANY_NAME}: Scraped - {title} - {len(requirements)} reqs")
-
-                except Exception as e:
-                    logger.warning(f"{self.COMPANY_NAME}: Error scraping {href}: {e}")
-                    continue
-
-        finally:
-            driver.quit()
-            logger.info(f"{self.COMPANY_NAME}: Driver closed. Total: {len(jobs)}")
-
-        return jobs
+        # Collect all "Read more" hrefs from the roles ul via XPath
+        job_links = self._collect_job_links(driver)
+        logger.info(f"{self.COMPANY_NAME}: Found {len(job_links)} job links")
+        return [{"url": href} for href in job_links]
 
     def _collect_job_links(self, driver) -> List[str]:
         """Find all 'Read more' links inside the roles ul. Falls back to page-wide scan."""
         links = []
         try:
             ul = driver.find_element(By.XPATH, self.ROLES_UL_XPATH)
-            anchors = ul.find_elements(By.TAG_NAME, "a")
-            for a in anchors:
-                href = a.get_attribute("href") or ""
-                if href and href not in links:
+            # All hrefs in one round-trip instead of get_attribute per anchor
+            hrefs = driver.execute_script(
+                "return Array.from(arguments[0].querySelectorAll('a')).map(function(a) { return a.href; });",
+                ul,
+            ) or []
+            seen: set = set()
+            for href in hrefs:
+                if href and href not in seen:
+                    seen.add(href)
                     links.append(href)
             logger.info(f"{self.COMPANY_NAME}: XPath found {len(links)} links in roles ul")
         except Exception as e:
@@ -108,7 +74,7 @@ class PostHogScraper(BaseScraper):
         if not links:
             # Fallback: any /careers/<slug> link on the page
             links = driver.execute_script("""
-                return Array.from(document.querySelectorAll('a[href]'))
+                return Array.from(new Set(Array.from(document.querySelectorAll('a[href]'))
                     .map(function(a) { return a.href; })
                     .filter(function(h) {
                         try {
@@ -116,9 +82,67 @@ class PostHogScraper(BaseScraper):
                             return url.hostname.includes('posthog.com') &&
                                    /\\/careers\\/[a-z0-9-]+/.test(url.pathname);
                         } catch(e) { return false; }
-                    })
-                    .filter(function(h, i, arr) { return arr.indexOf(h) === i; });
+                    })));
             """) or []
             logger.info(f"{self.COMPANY_NAME}: Fallback found {len(links)} links")
 
         return links
+
+    def _scrape_static(self, item: Dict) -> Optional[Dict]:
+        """
+        Build the job from the server-rendered HTML, without a browser
+
+        Role pages are statically generated, so the h1, list items and text
+        are in the response; pages without an h1 there go to the browser.
+        """
+        response = http_session.get(item["url"], timeout=self.DETAIL_READY_TIMEOUT)
+        response.raise_for_status()
+        page_html = NON_TEXT_RE.sub(" ", response.text)
+
+        h1 = H1_RE.search(page_html)
+        title = strip_tags(h1.group(1)) if h1 else ""
+        if not title:
+            return None
+
+        requirements = []
+        for li in LI_RE.findall(page_html):
+            text = strip_tags(li)
+            if len(text) > 10:
+                requirements.append(text)
+                if len(requirements) >= 20:
+                    break
+
+        job = self.create_job_dict(
+            title=title,
+            requirements=requirements[:15],
+            location="Remote",
+            url=item["url"],
+            description=html_to_text(page_html)[:self.MAX_DESCRIPTION_CHARS],
+        )
+        logger.info(f"{self.COMPANY_NAME}: Scraped (static) - {title} - {len(requirements)} reqs")
+        return job
+
+    def _scrape_detail(self, driver, item: Dict) -> Optional[Dict]:
+        """Scrape one role page into a job dict (None when it has no title)."""
+        href = item["url"]
+        self.open_detail(driver, href)
+
+        # Title, requirements and the full page text for tech_stack
+        data = driver.execute_script(self.DETAIL_JS, self.MAX_DESCRIPTION_CHARS) or {}
+        title = data.get("title") or ""
+        if not title:
+            logger.info(f"{self.COMPANY_NAME}: No h1 found at {href}, skipping")
+            return None
+
+        requirements = data.get("requirements") or []
+        description = data.get("description") or ""
+
+        job = self.create_job_dict(
+            title=title,
+            requirements=requirements[:15],
+            location="Remote",
+            url=href,
+            description=description,
+        )
+        logger.info(f"{self.COMPANY_NAME}: Scraped - {title} - {len(requirements)} reqs")
+        return job
@@ -1,106 +1,143 @@
-import asyncio
-import time
-from typing import List, Dict
+import re
+from typing import List, Dict, Optional
+from urllib.parse import urljoin
 
-from selenium.webdriver.common.by import By
-
-from scrapers.base_scraper import BaseScraper
+from scrapers.base_scraper import BaseScraper, http_session
+from scrapers.html_utils import LI_RE, NON_TEXT_RE, html_to_text, strip_tags
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+JOB_LINK_RE = re.compile(r'<a\b[^>]*\bhref="([^"]*/careers/[^"#?]+)"[^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+# From the "About you" heading up to "Things to know": the requirements list
+ABOUT_YOU_RE = re.compile(r'\bid="about-you"(.*?)\bid="things-to-know"', re.IGNORECASE | re.DOTALL)
+
 
 class RailwayScraper(BaseScraper):
     COMPANY_NAME = "railway"
     URL = "https://railway.com/careers#open-positions"
-
-    async def scrape(self) -> List[Dict]:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_scrape)
+    # Pages are server-rendered: anchors and h1 are in the initial DOM, so a
+    # long wait only delays the fallback read on a page that never renders
+    DETAIL_READY_TIMEOUT = 5  # seconds
+
+    # All <li> between #about-you and #things-to-know, plus the page text
+    DETAIL_JS = """
+        const requirements = [];
+        const start = document.getElementById('about-you');
+        let el = start ? start.nextElementSibling : null;
+        while (el) {
+            if (el.id === 'things-to-know') break;
+            if (el.tagName === 'LI') {
+                const t = el.textContent.trim();
+                if (t.length > 10) requirements.push(t);
+            }
+            el = el.nextElementSibling;
+        }
+        return {requirements: requirements, description: document.body.innerText.slice(0, arguments[0])};
+    """
 
     def _sync_scrape(self) -> List[Dict]:
-        jobs = []
-        driver = self._create_driver()
+        """
+        Read the server-rendered careers page over HTTP when it lists jobs
+
+        Falls back to the browser flow when the plain response has no job
+        links (or the request fails).
+        """
         try:
-            logger.info(f"{self.COMPANY_NAME}: Navigating to {self.URL}")
-            driver.get(self.URL)
-            time.sleep(3)
-
-            # Collect all job links
-            links = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/careers/"]')
-            logger.info(f"{self.COMPANY_NAME}: Found {len(links)} job links")
-
-            job_data = []
-            for link in links:
-                try:
-                    href = link.get_attribute("href") or ""
-                    if not href or href.rstrip("/").endswith("/careers"):
-                        continue
-
-                    title = link.text.strip()
-                    if not title or href in [j["url"] for j in job_data]:
-                        continue
-
-                    location = "Remote"
-                    if "Anywhere" in title:
-                        location = "Anywhere"
-                        title = title.replace("Anywhere", "").strip()
-                    elif "Hybrid" in title:
-                        location = "Hybrid"
-                        title = title.replace("Hybrid", "").strip()
-                    title = title.rstrip(": -")
-
-                    job_data.append({"url": href, "title": title, "location": location})
-                except Exception as e:
-                    logger.debug(f"{self.COMPANY_NAME}: Error reading link: {e}")
-                    continue
-
-            logger.info(f"{self.COMPANY_NAME}: Collected {len(job_data)} unique jobs")
-
-            for job_info in job_data:
-                try:
-                    driver.get(job_info["url"])
-                    time.sleep(2)
-
-                    # Extract requirements: all <li> between #about-you and #things-to-know
-                    requirements = driver.execute_script("""
-                        const results = [];
-                        const start = document.getElementById('about-you');
-                        if (!start) return results;
-                        let el = start.nextElementSibling;
-                        while (el) {
-                            if (el.id === 'things-to-know') break;
-                            if (el.tagName === 'LI') {
-                                const t = el.textContent.trim();
-                                if (t.length > 10) results.push(t);
-                            }
-                            el = el.nextElementSibling;
-                        }
-                        return results;
-                    """)
-
-                    # Use full page text for tech_stack (requirements section alone
-                    # rarely names specific technologies explicitly)
-                    description = driver.execute_script(
-                        "return document.body.innerText"
-                    ) or ""
-
-                    job = self.create_job_dict(
-                        title=job_info["title"],
-                        requirements=(requirements or [])[:15],
-                        location=job_info["location"],
-                        url=job_info["url"],
-                        description=description,
-                    )
-                    jobs.append(job)
-                    logger.info(f"{self.COMPANY_NAME}: Scraped job - {job_info['title']} ({job_info['location']}) - {len(requirements or [])} requirements")
-
-                except Exception as e:
-                    logger.warning(f"{self.COMPANY_NAME}: Error scraping {job_info['url']}: {e}")
-                    continue
-
-        finally:
-            driver.quit()
-            logger.info(f"{self.COMPANY_NAME}: Driver closed")
-
-        return jobs
+            response = http_session.get(self.URL, timeout=self.TIMEOUT)
+            response.raise_for_status()
+            links = [
+                {"url": urljoin(self.URL, href), "title": strip_tags(text)}
+                for href, text in JOB_LINK_RE.findall(response.text)
+            ]
+        except Exception as e:
+            logger.warning(f"{self.COMPANY_NAME}: Static listing failed ({e}), using the browser")
+            links = []
+
+        job_data = self._parse_links(links)
+        if not job_data:
+            return super()._sync_scrape()
+
+        logger.info(f"{self.COMPANY_NAME}: Found {len(job_data)} jobs in static HTML")
+        return self.scrape_details(job_data, self._scrape_detail)
+
+    def _list_jobs(self, driver) -> List[Dict]:
+        """Collect job links (title and location come from the link text)."""
+        # Past the nav's own /careers link: wait for the job anchors themselves
+        self.wait_for(driver, 'a[href*="/careers/"]', min_count=2)
+
+        links = self.collect_links(driver, 'a[href*="/careers/"]')
+        logger.info(f"{self.COMPANY_NAME}: Found {len(links)} job links")
+        return self._parse_links(links)
+
+    @staticmethod
+    def _parse_links(links: List[Dict]) -> List[Dict]:
+        """Dedupe job links and split the location off their text"""
+        job_data = []
+        seen_urls: set = set()
+        for link in links:
+            href, title = link["url"], link["title"]
+            if not href or href.rstrip("/").endswith("/careers"):
+                continue
+            if not title or href in seen_urls:
+                continue
+            seen_urls.add(href)
+
+            location = "Remote"
+            if "Anywhere" in title:
+                location = "Anywhere"
+                title = title.replace("Anywhere", "").strip()
+            elif "Hybrid" in title:
+                location = "Hybrid"
+                title = title.replace("Hybrid", "").strip()
+            title = title.rstrip(": -")
+
+            job_data.append({"url": href, "title": title, "location": location})
+        return job_data
+
+    def _scrape_static(self, job_info: Dict) -> Optional[Dict]:
+        """
+        Read a careers page from its server-rendered HTML
+
+        Pages without the "About you" / "Things to know" markers in the
+        response go to the browser.
+        """
+        response = http_session.get(job_info["url"], timeout=self.DETAIL_READY_TIMEOUT)
+        response.raise_for_status()
+        page_html = NON_TEXT_RE.sub(" ", response.text)
+
+        section = ABOUT_YOU_RE.search(page_html)
+        if not section:
+            return None
+
+        requirements = [text for text in map(strip_tags, LI_RE.findall(section.group(1))) if len(text) > 10]
+
+        job = self.create_job_dict(
+            title=job_info["title"],
+            requirements=requirements[:15],
+            location=job_info["location"],
+            url=job_info["url"],
+            description=html_to_text(page_html)[:self.MAX_DESCRIPTION_CHARS],
+        )
+        logger.info(f"{self.COMPANY_NAME}: Scraped (static) job - {job_info['title']} ({job_info['location']}) - {len(requirements)} requirements")
+        return job
+
+    def _scrape_detail(self, driver, job_info: Dict) -> Dict:
+        """Scrape one careers page into a job dict."""
+        self.open_detail(driver, job_info["url"])
+
+        # Requirements plus the full page text for tech_stack (the requirements
+        # section alone rarely names specific technologies), in one round-trip
+        data = driver.execute_script(self.DETAIL_JS, self.MAX_DESCRIPTION_CHARS) or {}
+        requirements = data.get("requirements") or []
+        description = data.get("description") or ""
+
+        job = self.create_job_dict(
+            title=job_info["title"],
+            requirements=requirements[:15],
+            location=job_info["location"],
+            url=job_info["url"],
+            description=description,
+        )
+        logger.info(f"{self.COMPANY_NAME}: Scraped job - {job_info['title']} ({job_info['location']}) - {len(requirements)} requirements")
+        return job
@@ -0,0 +1,43 @@
+"""
+Train the zstd dictionary CacheService compresses job payloads against
+
+Samples individual jobs from the cached `jobs:all` payload (one sample per
+job, so the dictionary learns the shared schema and boilerplate) and writes
+the result to CACHE_ZDICT_PATH. Run from the project root:
+
+    python -m scripts.train_cache_dict
+"""
+import asyncio
+
+import orjson
+import zstandard
+
+from services.cache_service import ZDICT_PATH, cache_service
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DICT_SIZE = 128 * 1024  # bytes
+
+
+async def train() -> None:
+    """Train a dictionary on the cached jobs and save it to ZDICT_PATH"""
+    await cache_service.connect()
+    try:
+        jobs = await cache_service.get_all_jobs() or []
+    finally:
+        await cache_service.disconnect()
+
+    if not jobs:
+        logger.error("No cached jobs to train on")
+        return
+
+    samples = [orjson.dumps(job) for job in jobs]
+    zdict = zstandard.train_dictionary(DICT_SIZE, samples)
+    with open(ZDICT_PATH, "wb") as f:
+        f.write(zdict.as_bytes())
+    logger.info(f"Trained {len(zdict.as_bytes())}-byte dictionary on {len(samples)} jobs -> {ZDICT_PATH}")
+
+
+if __name__ == "__main__":
+    asyncio.run(train())
@@ -1,7 +1,12 @@
 import os
-import json
+import uuid
+import socket
+import orjson
+import zstandard
 import redis.asyncio as redis
-from typing import Optional, List, Dict
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from typing import Any, AsyncIterator, Callable, Optional, List, Dict
 from datetime import datetime
 from dotenv import load_dotenv
 from utils.logger import setup_logger
@@ -9,23 +14,63 @@ from utils.logger import setup_logger
 load_dotenv()
 logger = setup_logger(__name__)
 
+# Leading byte of every packed payload, bumped whenever the format changes
+PAYLOAD_VERSION = b"\x01"
+# Same format, compressed against the trained dictionary at ZDICT_PATH
+PAYLOAD_VERSION_DICT = b"\x02"
+# Deletes the lock only while it still holds the caller's token, so an owner
+# whose lock expired can't release a lock another worker acquired since
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+# Pooled connections stay open between requests; keepalive probes stop idle
+# ones from being silently dropped by NATs/load balancers in between
+MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+KEEPALIVE_OPTIONS = {
+    getattr(socket, opt): value
+    for opt, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 30), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, opt)
+}
+# Fields fetched per HSCAN step when streaming jobs:all
+JOBS_SCAN_COUNT = 200
+# Keys requested per SCAN step and unlinked per call in clear_all
+CLEAR_BATCH_SIZE = 500
+# Shared zstd dictionary trained on job payloads (scripts/train_cache_dict.py)
+ZDICT_PATH = os.getenv("CACHE_ZDICT_PATH", "data/cache.zdict")
+
 
 class CacheService:
     """
     Async Redis cache service for job opportunities
 
     Key Structure:
-    - jobs:all -> JSON string of all jobs
-    - jobs:metadata -> JSON with cached_at, total_count, companies_status
-    - jobs:company:{company_name} -> JSON string of jobs for specific company
+    - jobs:all -> Hash of job id -> packed JSON of that job
+    - jobs:metadata -> Packed JSON with cached_at, total_count, companies_status
+    - jobs:company:{company_name} -> Packed JSON of jobs for specific company
     - jobs:last_scrape:{company_name} -> Timestamp of last successful scrape
     - jobs:errors:{company_name} -> JSON of last error if scrape failed
+    - jobs:status -> Hash of company name -> JSON scrape status
     - jobs:scrape_lock -> Distributed lock to prevent concurrent scrapes
+
+    Packed values are zstd-compressed JSON behind a one-byte version tag
+    (see `_pack`).
     """
 
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
+        self._pool: Optional[redis.ConnectionPool] = None
         self.ttl = 86400  # 24 hours in seconds
+        # Reused across calls so compression state is set up once
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._zdict: Optional[zstandard.ZstdCompressionDict] = None
+        self._dict_decompressor: Optional[zstandard.ZstdDecompressor] = None
+        # Value of the scrape lock while this instance holds it
+        self._lock_token: Optional[str] = None
+        self._release_lock = None
 
     async def connect(self):
         """Establish Redis connection on application startup"""
@@ -35,32 +80,97 @@ class CacheService:
         password = os.getenv("REDIS_PASSWORD", None)
 
         try:
-            self.redis = await redis.from_url(
+            self._pool = redis.ConnectionPool.from_url(
                 f"redis://{host}:{port}/{db}",
                 password=password,
-                encoding="utf-8",
-                decode_responses=True
+                # Values stay bytes: orjson parses them without a decode step
+                decode_responses=False,
+                max_connections=MAX_CONNECTIONS,
+                socket_keepalive=True,
+                socket_keepalive_options=KEEPALIVE_OPTIONS,
+                health_check_interval=30,
+                retry_on_timeout=True,
+                retry=Retry(ExponentialBackoff(cap=2, base=0.05), retries=3)
             )
+            self.redis = redis.Redis(connection_pool=self._pool)
             # Test connection
             await self.redis.ping()
+            self._release_lock = self.redis.register_script(RELEASE_LOCK_SCRIPT)
             logger.info(f"Redis connected successfully at {host}:{port}/{db}")
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
 
+        self._load_dictionary()
+
+    def _load_dictionary(self) -> None:
+        """Compress against the trained dictionary at ZDICT_PATH, if one exists"""
+        if not os.path.exists(ZDICT_PATH):
+            return
+        try:
+            with open(ZDICT_PATH, "rb") as f:
+                self._zdict = zstandard.ZstdCompressionDict(f.read())
+            self._compressor = zstandard.ZstdCompressor(level=3, dict_data=self._zdict)
+            self._dict_decompressor = zstandard.ZstdDecompressor(dict_data=self._zdict)
+            logger.info(f"Loaded zstd dictionary from {ZDICT_PATH}")
+        except Exception as e:
+            logger.error(f"Failed to load zstd dictionary, compressing without it: {e}")
+
     async def disconnect(self):
         """Close Redis connection on application shutdown"""
         if self.redis:
             await self.redis.close()
+            await self._pool.disconnect()
             logger.info("Redis connection closed")
 
+    # ============= Serialization =============
+
+    def _pack(self, value: Any, default: Optional[Callable] = None) -> bytes:
+        """
+        Serialize a value to zstd-compressed JSON
+
+        Args:
+            value: JSON-serializable value
+            default: orjson fallback for non-native types
+
+        Returns:
+            The version tag followed by the compressed JSON
+        """
+        version = PAYLOAD_VERSION_DICT if self._zdict else PAYLOAD_VERSION
+        return version + self._compressor.compress(orjson.dumps(value, default=default))
+
+    def _unpack(self, payload: bytes) -> Any:
+        """
+        Deserialize a payload written by `_pack`
+
+        Payloads without the version byte are plain JSON written before
+        compression was introduced, and are parsed as-is.
+        """
+        version = payload[:1]
+        if version == PAYLOAD_VERSION:
+            return orjson.loads(self._decompressor.decompress(payload[1:]))
+        if version == PAYLOAD_VERSION_DICT:
+            if not self._dict_decompressor:
+                raise ValueError(f"Payload needs the zstd dictionary, but none is loaded from {ZDICT_PATH}")
+            return orjson.loads(self._dict_decompressor.decompress(payload[1:]))
+        return orjson.loads(payload)
+
     # ============= Job Operations =============
 
+    def _queue_all_jobs(self, pipe, jobs: List[Dict]) -> None:
+        """Queue the commands replacing jobs:all with `jobs` on a pipeline"""
+        pipe.unlink("jobs:all")
+        if jobs:
+            pipe.hset("jobs:all", mapping={job["id"]: self._pack(job) for job in jobs})
+            pipe.expire("jobs:all", self.ttl)
+
     async def set_all_jobs(self, jobs: List[Dict]) -> None:
-        """Store all jobs in cache with TTL"""
+        """Store all jobs in cache with TTL (one hash field per job)"""
         try:
-            jobs_json = json.dumps(jobs)
-            await self.redis.setex("jobs:all", self.ttl, jobs_json)
+            # MULTI/EXEC so readers never see the hash half-replaced
+            async with self.redis.pipeline(transaction=True) as pipe:
+                self._queue_all_jobs(pipe, jobs)
+                await pipe.execute()
             logger.info(f"Cached {len(jobs)} jobs with {self.ttl}s TTL")
         except Exception as e:
             logger.error(f"Error caching all jobs: {e}")
@@ -69,19 +179,31 @@ class CacheService:
     async def get_all_jobs(self) -> Optional[List[Dict]]:
         """Retrieve all jobs from cache"""
         try:
-            jobs_json = await self.redis.get("jobs:all")
-            if jobs_json:
-                return json.loads(jobs_json)
-            return None
+            jobs = [job async for job in self.iter_all_jobs()]
+            return jobs or None
         except Exception as e:
             logger.error(f"Error retrieving all jobs: {e}")
             return None
 
+    async def iter_all_jobs(self) -> AsyncIterator[Dict]:
+        """
+        Stream cached jobs in HSCAN batches
+
+        Only the fields of the current batch are held and decoded at a
+        time, so a caller that stops early (e.g. after one page) never
+        deserializes the rest.
+
+        Yields:
+            Job dicts, in no particular order
+        """
+        async for _, job_json in self.redis.hscan_iter("jobs:all", count=JOBS_SCAN_COUNT):
+            yield self._unpack(job_json)
+
     async def set_company_jobs(self, company: str, jobs: List[Dict]) -> None:
         """Store jobs for a specific company"""
         try:
             key = f"jobs:company:{company}"
-            jobs_json = json.dumps(jobs)
+            jobs_json = self._pack(jobs)
             await self.redis.setex(key, self.ttl, jobs_json)
             logger.info(f"Cached {len(jobs)} jobs for {company}")
         except Exception as e:
@@ -93,7 +215,7 @@ class CacheService:
             key = f"jobs:company:{company}"
             jobs_json = await self.redis.get(key)
             if jobs_json:
-                return json.loads(jobs_json)
+                return self._unpack(jobs_json)
             return None
         except Exception as e:
             logger.error(f"Error retrieving jobs for {company}: {e}")
@@ -104,7 +226,7 @@ class CacheService:
     async def set_metadata(self, metadata: Dict) -> None:
         """Store metadata about scraping results"""
         try:
-            metadata_json = json.dumps(metadata, default=str)
+            metadata_json = self._pack(metadata, default=str)
             await self.redis.setex("jobs:metadata", self.ttl, metadata_json)
             logger.info("Cached jobs metadata")
         except Exception as e:
@@ -115,7 +237,7 @@ class CacheService:
         try:
             metadata_json = await self.redis.get("jobs:metadata")
             if metadata_json:
-                return json.loads(metadata_json)
+                return self._unpack(metadata_json)
             return {
                 "total_count": 0,
                 "filtered_count": 0,
@@ -129,31 +251,80 @@ class CacheService:
     async def set_scrape_status(self, company: str, status: str, job_count: int, error: Optional[str] = None) -> None:
         """Update scraping status for a company"""
         try:
-            status_data = {
-                "last_scraped": datetime.now().isoformat(),
-                "status": status,
-                "job_count": job_count,
-                "error": error
-            }
-            key = f"jobs:status:{company}"
-            status_json = json.dumps(status_data)
-            await self.redis.setex(key, self.ttl, status_json)
+            status_json = orjson.dumps(self._status_data(status, job_count, error))
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset("jobs:status", company, status_json)
+                pipe.expire("jobs:status", self.ttl)
+                await pipe.execute()
             logger.info(f"Updated status for {company}: {status}")
         except Exception as e:
             logger.error(f"Error setting status for {company}: {e}")
 
+    @staticmethod
+    def _status_data(status: str, job_count: int, error: Optional[str] = None) -> Dict:
+        """Build the stored status payload for one company"""
+        return {
+            "last_scraped": datetime.now().isoformat(),
+            "status": status,
+            "job_count": job_count,
+            "error": error
+        }
+
     async def get_scrape_status(self, company: str) -> Optional[Dict]:
         """Get scraping status for a company"""
         try:
-            key = f"jobs:status:{company}"
-            status_json = await self.redis.get(key)
+            status_json = await self.redis.hget("jobs:status", company)
             if status_json:
-                return json.loads(status_json)
+                return orjson.loads(status_json)
             return None
         except Exception as e:
             logger.error(f"Error getting status for {company}: {e}")
             return None
 
+    async def get_all_statuses(self) -> Dict[str, Dict]:
+        """Get the scraping status of every company in one round-trip"""
+        try:
+            statuses = await self.redis.hgetall("jobs:status")
+            return {company.decode(): orjson.loads(status_json) for company, status_json in statuses.items()}
+        except Exception as e:
+            logger.error(f"Error getting statuses: {e}")
+            return {}
+
+    async def commit_scrape(
+        self,
+        jobs: List[Dict],
+        metadata: Dict,
+        statuses: Dict[str, Dict]
+    ) -> None:
+        """
+        Store the results of a scrape run in a single round-trip
+
+        Equivalent to `set_all_jobs` + `set_metadata` + one `set_scrape_status`
+        per company, but every write goes out in one MULTI/EXEC pipeline.
+
+        Args:
+            jobs: All scraped jobs
+            metadata: Scrape metadata
+            statuses: Company name -> {"status", "job_count", "error"}
+        """
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                self._queue_all_jobs(pipe, jobs)
+                pipe.setex("jobs:metadata", self.ttl, self._pack(metadata, default=str))
+                if statuses:
+                    pipe.hset("jobs:status", mapping={
+                        company: orjson.dumps(self._status_data(
+                            status["status"], status.get("job_count", 0), status.get("error")
+                        ))
+                        for company, status in statuses.items()
+                    })
+                    pipe.expire("jobs:status", self.ttl)
+                await pipe.execute()
+            logger.info(f"Cached {len(jobs)} jobs, metadata and {len(statuses)} statuses")
+        except Exception as e:
+            logger.error(f"Error committing scrape results: {e}")
+            raise
+
     # ============= Lock Operations =============
 
     async def acquire_scrape_lock(self) -> bool:
@@ -163,9 +334,11 @@ class CacheService:
         """
         try:
             lock_key = "jobs:scrape_lock"
+            token = uuid.uuid4().hex
             # NX = only set if not exists, EX = expire in seconds
-            locked = await self.redis.set(lock_key, "locked", nx=True, ex=3600)
+            locked = await self.redis.set(lock_key, token, nx=True, ex=3600)
             if locked:
+                self._lock_token = token
                 logger.info("Scrape lock acquired")
                 return True
             else:
@@ -176,10 +349,16 @@ class CacheService:
             return False
 
     async def release_scrape_lock(self) -> None:
-        """Release distributed lock for scraping"""
+        """Release distributed lock for scraping, if this instance still holds it"""
+        if self._lock_token is None:
+            return
         try:
-            await self.redis.delete("jobs:scrape_lock")
-            logger.info("Scrape lock released")
+            released = await self._release_lock(keys=["jobs:scrape_lock"], args=[self._lock_token])
+            self._lock_token = None
+            if released:
+                logger.info("Scrape lock released")
+            else:
+                logger.warning("Scrape lock expired before release")
         except Exception as e:
             logger.error(f"Error releasing scrape lock: {e}")
 
@@ -188,10 +367,19 @@ class CacheService:
     async def clear_all(self) -> None:
         """Clear all job-related cache (useful for testing)"""
         try:
-            keys = await self.redis.keys("jobs:*")
-            if keys:
-                await self.redis.delete(*keys)
-                logger.info(f"Cleared {len(keys)} cache keys")
+            # SCAN walks the keyspace incrementally instead of blocking Redis
+            # like KEYS; UNLINK frees the values in a background thread
+            cleared = 0
+            batch = []
+            async for key in self.redis.scan_iter(match="jobs:*", count=CLEAR_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= CLEAR_BATCH_SIZE:
+                    cleared += await self.redis.unlink(*batch)
+                    batch.clear()
+            if batch:
+                cleared += await self.redis.unlink(*batch)
+            if cleared:
+                logger.info(f"Cleared {cleared} cache keys")
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
 
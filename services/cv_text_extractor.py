@@ -0,0 +1,147 @@
+import io
+import os
+import re
+import hashlib
+import threading
+from typing import Dict, Iterable, Iterator, Optional
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+
+# PDFium is not thread-safe and extraction runs in worker threads, so every
+# call into it is serialized. Held per call rather than per document, so no
+# lock is held while a page's text is handed to the caller.
+PDFIUM_LOCK = threading.Lock()
+
+
+def build_trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation with shared prefixes factored out
+
+    `a|ab|ac` becomes `a(?:b|c)?`-style nesting, so the engine walks each
+    common prefix once instead of retrying it for every alternative.
+    """
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end-of-word marker
+
+    def render(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A word ends here, so the rest is optional
+            if len(branches) == 1 and len(body) > 1:
+                body = "(?:" + body + ")"
+            return body + "?"
+        return body
+
+    return render(trie)
+
+
+class CVTooLargeError(ValueError):
+    """Raised when a CV's extracted text exceeds `CVTextExtractor.MAX_CV_CHARS`"""
+
+
+class CVTextExtractor:
+    """Extract plain text from an uploaded CV (PDF) and mark its sections"""
+
+    # Hard cap on extracted text; real CVs are far below this, so anything
+    # larger is rejected before it costs memory or LLM tokens
+    MAX_CV_CHARS = 200_000
+
+    # "pdfium" (PDFium C++ core, default) or "pdfplumber" (pure-Python
+    # pdfminer with layout analysis, kept as a fallback)
+    PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfium")
+
+    # Extracted text of recent uploads keyed by a digest of the PDF bytes,
+    # so re-uploading the same file (retries, re-analysis against another
+    # job) skips parsing entirely
+    CACHE_MAX = 256
+    _cache: Dict[bytes, str] = {}
+
+    # Section headers (PT/EN) to surface as markdown headings for the LLM
+    SECTION_KEYWORDS = (
+        "experiência", "experiencia", "experience", "formação", "formacao",
+        "education", "habilidades", "skills", "projetos", "projects",
+        "certificações", "certifications",
+    )
+    SECTION_RE = re.compile("(?i)(" + build_trie_pattern(SECTION_KEYWORDS) + ")")
+
+    @staticmethod
+    def digest(file_bytes: bytes) -> bytes:
+        """Content digest identifying an uploaded file"""
+        return hashlib.blake2b(file_bytes, digest_size=16).digest()
+
+    @classmethod
+    def get_cached(cls, digest: bytes) -> Optional[str]:
+        """Return previously extracted text for a file digest, if any"""
+        return cls._cache.get(digest)
+
+    @classmethod
+    def extract(cls, file_bytes: bytes, digest: Optional[bytes] = None) -> str:
+        """
+        Extract text from PDF bytes and mark section headers
+
+        CPU-bound and synchronous: callers on the event loop should run it
+        through `asyncio.to_thread`.
+
+        Args:
+            file_bytes: Raw PDF file content
+            digest: `digest(file_bytes)`, if already computed by the caller
+
+        Returns:
+            Extracted text with `### <section>` markers
+
+        Raises:
+            CVTooLargeError: Extracted text exceeds `MAX_CV_CHARS`
+        """
+        # Write pages into one buffer as they are extracted instead of
+        # holding every page string at once, and stop early on huge input
+        buf = io.StringIO()
+        for i, text in enumerate(cls._iter_page_texts(file_bytes)):
+            if i:
+                buf.write("\n")
+            buf.write(text)
+            if buf.tell() > cls.MAX_CV_CHARS:
+                raise CVTooLargeError(f"CV text exceeds {cls.MAX_CV_CHARS} characters")
+        contents = cls.SECTION_RE.sub(r'\n### \1\n', buf.getvalue())
+
+        # Evict the oldest entry once full (dicts keep insertion order)
+        if len(cls._cache) >= cls.CACHE_MAX:
+            cls._cache.pop(next(iter(cls._cache)), None)
+        cls._cache[digest or cls.digest(file_bytes)] = contents
+
+        return contents
+
+    @classmethod
+    def _iter_page_texts(cls, file_bytes: bytes) -> Iterator[str]:
+        """Yield the plain text of each page using the configured backend"""
+        if cls.PDF_BACKEND == "pdfplumber":
+            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+                for page in pdf.pages:
+                    yield page.extract_text() or ""
+            return
+
+        with PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(file_bytes)
+            page_count = len(pdf)
+        try:
+            for index in range(page_count):
+                with PDFIUM_LOCK:
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    try:
+                        text = textpage.get_text_range()
+                    finally:
+                        textpage.close()
+                        page.close()
+                yield text.replace("\r\n", "\n")
+        finally:
+            with PDFIUM_LOCK:
+                pdf.close()
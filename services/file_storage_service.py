@@ -1,13 +1,27 @@
 import os
-import json
+import copy
+import fcntl
+import bisect
 import asyncio
-from typing import Optional, List, Dict
+import orjson
+import threading
+from typing import Callable, Optional, List, Dict, Sequence, Tuple
 from datetime import datetime
 from pathlib import Path
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Above this many stored jobs, query scans run in a worker thread so they
+# don't block the event loop; below it the thread hop costs more than it saves
+QUERY_THREAD_THRESHOLD = 2000
+
+# Datetimes go through `default=str` (as json.dump did) so stored timestamps
+# keep their format; STORAGE_PRETTY_JSON=1 indents the file for debugging
+DUMP_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | (
+    orjson.OPT_INDENT_2 if os.getenv("STORAGE_PRETTY_JSON") == "1" else 0
+)
+
 
 class FileStorageService:
     """
@@ -20,7 +34,40 @@ class FileStorageService:
         self.storage_dir = Path("data")
         self.jobs_file = self.storage_dir / "jobs.json"
         self.lock_file = self.storage_dir / "scrape.lock"
+        self.scheduler_lock_file = self.storage_dir / "scheduler.lock"
+        # Open descriptor holding the flock while this process scrapes
+        self._lock_fd: Optional[int] = None
+        # Open descriptor holding the scheduler flock for the process lifetime
+        self._scheduler_lock_fd: Optional[int] = None
+
+        # In-memory inverted indexes over the stored (sorted) job list,
+        # rebuilt whenever the jobs file changes on disk
+        self._jobs: List[Dict] = []
+        # Sort keys of `_jobs` in ascending order (the reverse of the stored
+        # order), so a cursor position is a bisect away
+        self._ascending_keys: List[Tuple[str, str]] = []
+        self._shards: Dict[str, List[Dict]] = {}
+        self._by_company: Dict[str, List[int]] = {}
+        self._by_location: Dict[str, List[int]] = {}
+        self._by_tech: Dict[str, List[int]] = {}
+        # `_file_version` of the data the indexes were built from
+        self._indexed_version: Optional[Tuple[int, int]] = None
+        # Guards the index swap against scans running in worker threads
+        self._index_lock = threading.Lock()
+        # File I/O runs in worker threads; this keeps read-modify-write
+        # updates from interleaving
+        self._write_lock = asyncio.Lock()
+        # Last parsed file contents, keyed by the file's (mtime_ns, size) so
+        # writes from other workers are picked up on the next read
+        self._cache: Tuple[Optional[Tuple[int, int]], Optional[Dict]] = (None, None)
 
+    async def connect(self):
+        """
+        Create the data directory and an empty jobs file if missing
+
+        Done here rather than at import, so loading the module (e.g. in the
+        gunicorn master under preload_app) never writes to disk.
+        """
         # Create data directory if it doesn't exist
         self.storage_dir.mkdir(exist_ok=True)
 
@@ -34,44 +81,114 @@ class FileStorageService:
                     "companies": {}
                 }
             })
-
-    async def connect(self):
-        """Placeholder for compatibility with Redis service"""
         logger.info(f"File storage initialized at {self.storage_dir.absolute()}")
 
     async def disconnect(self):
         """Placeholder for compatibility with Redis service"""
         logger.info("File storage closed")
 
+    def _file_version(self) -> Tuple[int, int]:
+        """Identify the current contents of the jobs file"""
+        stat = self.jobs_file.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _cached_data(self) -> Optional[Dict]:
+        """Return the parsed data if the jobs file hasn't changed since it was read"""
+        version, data = self._cache
+        if data is not None and version == self._file_version():
+            return data
+        return None
+
     def _read_data(self) -> Dict:
-        """Read data from JSON file"""
+        """
+        Read data from JSON file
+
+        The file is only parsed when it changed since the last read or
+        write; otherwise the in-memory copy is returned.
+        """
         try:
-            with open(self.jobs_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            data = self._cached_data()
+            if data is not None:
+                return data
+            version = self._file_version()
+            with open(self.jobs_file, 'rb') as f:
+                data = orjson.loads(f.read())
+            self._cache = (version, data)
+            return data
         except Exception as e:
             logger.error(f"Error reading jobs file: {e}")
             return {"jobs": [], "metadata": {"total_count": 0, "cached_at": datetime.now().isoformat(), "companies": {}}}
 
     def _write_data(self, data: Dict):
-        """Write data to JSON file"""
+        """
+        Write data to JSON file
+
+        The data is written to a temporary file that then replaces the jobs
+        file, so readers (and a crash mid-write) never see a partial file.
+        """
+        # Per-process name: gunicorn workers share the data directory
+        tmp_file = self.storage_dir / f"jobs.json.{os.getpid()}.tmp"
         try:
-            with open(self.jobs_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            payload = orjson.dumps(data, default=str, option=DUMP_OPTIONS)
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_file, self.jobs_file)
+            # Cache what a reader would parse (datetimes as strings), not the
+            # caller's objects
+            self._cache = (self._file_version(), orjson.loads(payload))
         except Exception as e:
             logger.error(f"Error writing jobs file: {e}")
             raise
 
+    async def _update(self, mutate: Callable[[Dict], None]) -> None:
+        """
+        Read, modify and rewrite the jobs file off the event loop
+
+        Args:
+            mutate: Applied to the loaded data dict in a worker thread
+                before it is written back
+        """
+        def apply():
+            data = self._read_data()
+            try:
+                mutate(data)
+                self._write_data(data)
+            except Exception:
+                # The cached dict may be half-mutated; re-read it next time
+                self._cache = (None, None)
+                raise
+
+        async with self._write_lock:
+            await asyncio.to_thread(apply)
+
+    async def _load(self) -> Dict:
+        """
+        Return the stored data, parsing the file in a worker thread only if it changed
+
+        The returned dict is the shared cache entry; public getters copy
+        whatever they hand out.
+        """
+        data = self._cached_data()
+        if data is None:
+            data = await asyncio.to_thread(self._read_data)
+        return data
+
+    async def _refresh_indexes(self) -> None:
+        """Rebuild the indexes in a worker thread if the jobs file changed"""
+        if self._file_version() != self._indexed_version:
+            await asyncio.to_thread(self._ensure_indexes)
+
     # ============= Job Operations =============
 
     async def set_all_jobs(self, jobs: List[Dict]) -> None:
         """Store all jobs in file"""
-        try:
-            data = self._read_data()
-            data["jobs"] = jobs
+        def store(data: Dict) -> None:
+            data["jobs"] = self._sort_jobs([self.public_job(j) for j in jobs])
             data["metadata"]["total_count"] = len(jobs)
             data["metadata"]["cached_at"] = datetime.now().isoformat()
 
-            self._write_data(data)
+        try:
+            await self._update(store)
             logger.info(f"Stored {len(jobs)} jobs to file")
         except Exception as e:
             logger.error(f"Error storing all jobs: {e}")
@@ -79,63 +196,245 @@ class FileStorageService:
 
     async def get_all_jobs(self) -> Optional[List[Dict]]:
         """Retrieve all jobs from file"""
+        return await self.get_jobs()
+
+    async def get_jobs(self, company: Optional[str] = None) -> List[Dict]:
+        """
+        Retrieve stored jobs, or just one company's shard
+
+        Jobs are pre-grouped per company when indexed, so a company lookup
+        returns its shard directly without touching other companies' jobs.
+        """
         try:
-            data = self._read_data()
-            return data.get("jobs", [])
+            await self._refresh_indexes()
+            if company is None:
+                return list(self._jobs)
+            return list(self._shards.get(company.lower(), []))
         except Exception as e:
-            logger.error(f"Error retrieving all jobs: {e}")
+            logger.error(f"Error retrieving jobs (company={company}): {e}")
             return []
 
-    async def set_company_jobs(self, company: str, jobs: List[Dict]) -> None:
-        """Store jobs for a specific company (updates the main jobs list)"""
+    async def query_jobs(
+        self,
+        company: Optional[str] = None,
+        location: Optional[str] = None,
+        tech_stack: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        Filter and paginate jobs inside the storage layer
+
+        All filters are answered from the inverted indexes, so only
+        matching jobs are touched. Jobs are stored sorted by
+        `sort_key` (descending), so pagination is keyset-based: the page
+        starts right behind the `after` key, found by bisection, and only
+        the requested page is materialized. The total is the size of the
+        candidate list, so counting every match costs nothing extra.
+
+        Args:
+            company: Company filter (exact, case-insensitive)
+            location: Location filter (case-insensitive partial match)
+            tech_stack: Technology filter (case-insensitive, searches `skills`)
+            limit: Maximum number of results to return
+            after: Sort key of the last job of the previous page
+
+        Returns:
+            Tuple of (page of jobs, total number of matching jobs)
+        """
         try:
-            data = self._read_data()
+            await self._refresh_indexes()
+
+            args = (company, location, tech_stack, limit, after)
+            if len(self._jobs) > QUERY_THREAD_THRESHOLD:
+                return await asyncio.to_thread(self._scan_jobs, *args)
+            return self._scan_jobs(*args)
+        except Exception as e:
+            logger.error(f"Error querying jobs: {e}")
+            raise
 
-            # Remove old jobs from this company
-            existing_jobs = [j for j in data.get("jobs", []) if j.get("company") != company]
+    def _scan_jobs(
+        self,
+        company: Optional[str],
+        location: Optional[str],
+        tech_stack: Optional[str],
+        limit: Optional[int],
+        after: Optional[Tuple[str, str]]
+    ) -> Tuple[List[Dict], int]:
+        """Resolve candidates and build the requested page (sync, thread-safe)"""
+        with self._index_lock:
+            candidates = self._candidates(company, location, tech_stack)
+            start = 0
+            if after is not None:
+                # First stored position whose key sorts strictly after the
+                # cursor, then the first candidate at or behind it
+                first_pos = len(self._jobs) - bisect.bisect_left(self._ascending_keys, after)
+                start = bisect.bisect_left(candidates, first_pos)
+            end = None if limit is None else start + limit
+
+            page = [self.public_job(self._jobs[pos]) for pos in candidates[start:end]]
+            return page, len(candidates)
+
+    @staticmethod
+    def sort_key(job: Dict) -> Tuple[str, str]:
+        """Keyset pagination key; jobs are stored in descending order of it"""
+        return (job.get("posting_date") or "", job.get("id", ""))
+
+    def _sort_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """Sort jobs newest-first by `sort_key` so pages can be sliced by key"""
+        return sorted(jobs, key=self.sort_key, reverse=True)
+
+    @staticmethod
+    def _index_job(job: Dict) -> Dict:
+        """
+        Attach lowercase shadow fields used for filtering
 
-            # Add new jobs
-            existing_jobs.extend(jobs)
+        Computed once per load of the jobs file, on in-memory copies only,
+        so queries compare already-normalized strings instead of calling
+        `.lower()` per job per request. They are never written to disk.
+        """
+        job["_company_lc"] = job.get("company", "").lower()
+        job["_location_lc"] = job.get("location", "").lower()
+        job["_skills_lc"] = [s.lower() for s in job.get("skills", [])]
+        # Single delimited string so a tech filter is one C-level substring search
+        job["_tech_blob"] = "|" + "|".join(job["_skills_lc"]) + "|"
+        return job
+
+    @staticmethod
+    def public_job(job: Dict) -> Dict:
+        """Strip internal shadow fields before a job leaves the service"""
+        return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    def _ensure_indexes(self) -> None:
+        """
+        Rebuild the inverted indexes if the jobs file changed since last build
 
-            data["jobs"] = existing_jobs
-            data["metadata"]["total_count"] = len(existing_jobs)
+        The indexes are tagged with the version of the cache entry they were
+        built from, the same (mtime_ns, size) key `_read_data` uses, so a
+        reload of the data always rebuilds them too.
+        """
+        if self._file_version() == self._indexed_version:
+            return
+
+        data = self._read_data()
+        version, cached = self._cache
+        # A failed read returns an uncached fallback: index it, but retry next time
+        if cached is not data:
+            version = None
+        # Shadow fields go on copies: the parsed data is what the next
+        # update writes back. Sorting is linear for the already-sorted file
+        # and orders files written before jobs were stored sorted.
+        jobs = self._sort_jobs([self._index_job(dict(job)) for job in data.get("jobs", [])])
+        shards: Dict[str, List[Dict]] = {}
+        by_company: Dict[str, List[int]] = {}
+        by_location: Dict[str, List[int]] = {}
+        by_tech: Dict[str, List[int]] = {}
+        for pos, job in enumerate(jobs):
+            shards.setdefault(job["_company_lc"], []).append(job)
+            by_company.setdefault(job["_company_lc"], []).append(pos)
+            by_location.setdefault(job["_location_lc"], []).append(pos)
+            for skill in set(job["_skills_lc"]):
+                by_tech.setdefault(skill, []).append(pos)
+
+        ascending_keys = [self.sort_key(job) for job in reversed(jobs)]
+        with self._index_lock:
+            self._jobs = jobs
+            self._ascending_keys = ascending_keys
+            self._shards = shards
+            self._by_company = by_company
+            self._by_location = by_location
+            self._by_tech = by_tech
+            self._indexed_version = version
+        logger.info(f"Indexed {len(jobs)} jobs ({len(by_company)} companies, {len(by_tech)} skills)")
+
+    def _candidates(
+        self,
+        company: Optional[str],
+        location: Optional[str],
+        tech_stack: Optional[str]
+    ) -> Sequence[int]:
+        """
+        Resolve filters to sorted job positions
 
-            self._write_data(data)
-            logger.info(f"Updated {len(jobs)} jobs for {company}")
+        Company is an exact key lookup. Location and technology keep their
+        substring semantics by scanning the distinct index keys (a handful
+        of locations, far fewer skills than job x skill pairs) and unioning
+        the postings of every key that contains the query.
+        """
+        if not company and not location and not tech_stack:
+            return range(len(self._jobs))
+
+        candidates = None
+        if company:
+            candidates = set(self._by_company.get(company.lower(), []))
+
+        for query, index in ((tech_stack, self._by_tech), (location, self._by_location)):
+            if not query:
+                continue
+            if candidates is not None and not candidates:
+                break
+            query_lower = query.lower()
+            matches = set()
+            for key, positions in index.items():
+                if query_lower in key:
+                    matches.update(positions)
+            candidates = matches if candidates is None else candidates & matches
+
+        return sorted(candidates)
+
+    async def commit_scrape(self, jobs: List[Dict], metadata: Dict) -> None:
+        """
+        Store the results of a scrape run in a single write
+
+        Replaces every stored job and the metadata (including per-company
+        statuses) at once, instead of rewriting the file once per company
+        and then again for the job list and the metadata.
+
+        Args:
+            jobs: All jobs of the run, including cached jobs kept for failed companies
+            metadata: Scrape metadata with per-company statuses
+        """
+        def store(data: Dict) -> None:
+            data["jobs"] = self._sort_jobs([self.public_job(j) for j in jobs])
+            data["metadata"] = metadata
+
+        try:
+            await self._update(store)
+            logger.info(f"Stored {len(jobs)} jobs and metadata for {len(metadata.get('companies', {}))} companies")
         except Exception as e:
-            logger.error(f"Error storing jobs for {company}: {e}")
+            logger.error(f"Error committing scrape results: {e}")
+            raise
 
     async def get_company_jobs(self, company: str) -> Optional[List[Dict]]:
         """Retrieve jobs for a specific company"""
-        try:
-            data = self._read_data()
-            company_jobs = [j for j in data.get("jobs", []) if j.get("company") == company]
-            return company_jobs if company_jobs else None
-        except Exception as e:
-            logger.error(f"Error retrieving jobs for {company}: {e}")
-            return None
+        return await self.get_jobs(company) or None
 
     # ============= Metadata Operations =============
 
     async def set_metadata(self, metadata: Dict) -> None:
         """Store metadata about scraping results"""
-        try:
-            data = self._read_data()
+        def store(data: Dict) -> None:
             data["metadata"] = metadata
-            self._write_data(data)
+
+        try:
+            await self._update(store)
             logger.info("Stored metadata")
         except Exception as e:
             logger.error(f"Error storing metadata: {e}")
 
     async def get_metadata(self) -> Dict:
-        """Retrieve scraping metadata"""
+        """
+        Retrieve scraping metadata
+
+        Returns a copy: the parsed file stays cached between reads, so
+        callers must not be able to write into it.
+        """
         try:
-            data = self._read_data()
-            return data.get("metadata", {
-                "total_count": 0,
-                "cached_at": datetime.now().isoformat(),
-                "companies": {}
-            })
+            data = await self._load()
+            metadata = data.get("metadata")
+            if metadata is None:
+                return {"total_count": 0, "cached_at": datetime.now().isoformat(), "companies": {}}
+            return copy.deepcopy(metadata)
         except Exception as e:
             logger.error(f"Error retrieving metadata: {e}")
             return {"total_count": 0, "cached_at": datetime.now().isoformat(), "companies": {}}
@@ -143,31 +442,40 @@ class FileStorageService:
     async def set_scrape_status(self, company: str, status: str, job_count: int, error: Optional[str] = None) -> None:
         """Update scraping status for a company"""
         try:
-            data = self._read_data()
-
-            if "metadata" not in data:
-                data["metadata"] = {"companies": {}}
-            if "companies" not in data["metadata"]:
-                data["metadata"]["companies"] = {}
-
-            data["metadata"]["companies"][company] = {
-                "last_scraped": datetime.now().isoformat(),
-                "status": status,
-                "count": job_count,
-                "error": error
-            }
-
-            self._write_data(data)
+            await self._update(lambda data: self._apply_scrape_status(data, company, status, job_count, error))
             logger.info(f"Updated status for {company}: {status}")
         except Exception as e:
             logger.error(f"Error setting status for {company}: {e}")
 
+    @staticmethod
+    def _apply_scrape_status(
+        data: Dict,
+        company: str,
+        status: str,
+        job_count: int,
+        error: Optional[str]
+    ) -> None:
+        """Set one company's scrape status in an already-loaded data dict"""
+        if "metadata" not in data:
+            data["metadata"] = {"companies": {}}
+        if "companies" not in data["metadata"]:
+            data["metadata"]["companies"] = {}
+
+        data["metadata"]["companies"][company] = {
+            "last_scraped": datetime.now().isoformat(),
+            "status": status,
+            "count": job_count,
+            "error": error
+        }
+
     async def get_scrape_status(self, company: str) -> Optional[Dict]:
         """Get scraping status for a company"""
         try:
-            data = self._read_data()
+            data = await self._load()
             companies = data.get("metadata", {}).get("companies", {})
-            return companies.get(company)
+            status = companies.get(company)
+            # Copy, so callers can't modify the cached file contents
+            return dict(status) if status is not None else None
         except Exception as e:
             logger.error(f"Error getting status for {company}: {e}")
             return None
@@ -176,50 +484,104 @@ class FileStorageService:
 
     async def acquire_scrape_lock(self) -> bool:
         """
-        Acquire lock for scraping using a lock file
+        Acquire lock for scraping using an flock on the lock file
         Returns True if lock acquired, False if already locked
+
+        The kernel grants the flock to one open file at a time and drops it
+        when the holder exits, so a crashed run never leaves a stale lock
+        and there is no takeover step for two workers to race on.
         """
+        if self._lock_fd is not None:
+            logger.warning("Scrape lock already held, skipping")
+            return False
         try:
-            if self.lock_file.exists():
-                # Check if lock is stale (older than 1 hour)
-                lock_age = datetime.now().timestamp() - self.lock_file.stat().st_mtime
-                if lock_age > 3600:  # 1 hour
-                    logger.warning("Stale lock detected, removing")
-                    self.lock_file.unlink()
-                else:
-                    logger.warning("Scrape lock already held, skipping")
-                    return False
-
-            # Create lock file
-            self.lock_file.touch()
-            logger.info("Scrape lock acquired")
-            return True
+            self._lock_fd = self._try_flock(self.lock_file)
         except Exception as e:
             logger.error(f"Error acquiring scrape lock: {e}")
             return False
 
+        if self._lock_fd is None:
+            logger.warning("Scrape lock already held, skipping")
+            return False
+        logger.info("Scrape lock acquired")
+        return True
+
     async def release_scrape_lock(self) -> None:
-        """Release lock for scraping"""
+        """Release lock for scraping, if this process holds it"""
+        if self._lock_fd is None:
+            return
         try:
-            if self.lock_file.exists():
-                self.lock_file.unlink()
-                logger.info("Scrape lock released")
+            # The file is left in place: unlinking it would let a new file
+            # be locked while another worker still holds the old one
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            logger.info("Scrape lock released")
         except Exception as e:
             logger.error(f"Error releasing scrape lock: {e}")
+        finally:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def acquire_scheduler_lock(self) -> bool:
+        """
+        Claim the scheduler role for this process
+
+        Gunicorn workers each run the app lifespan; only the worker holding
+        this flock runs the scheduler. It is never released explicitly: the
+        kernel drops it when the worker exits, and the replacement worker
+        gunicorn forks claims it on startup.
+
+        Returns:
+            True if this process holds the scheduler lock
+        """
+        if self._scheduler_lock_fd is None:
+            try:
+                self._scheduler_lock_fd = self._try_flock(self.scheduler_lock_file)
+            except Exception as e:
+                logger.error(f"Error acquiring scheduler lock: {e}")
+        return self._scheduler_lock_fd is not None
+
+    @staticmethod
+    def _try_flock(path: Path) -> Optional[int]:
+        """
+        Take an exclusive, non-blocking flock on a lock file
+
+        Args:
+            path: Lock file, created if missing and never deleted
+
+        Returns:
+            The open descriptor holding the lock, or None if another open
+            file holds it
+        """
+        fd = os.open(path, os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        except Exception:
+            os.close(fd)
+            raise
+
+        # Record the holder for whoever inspects the file; the lock itself is the flock
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        return fd
 
     # ============= Utility Operations =============
 
     async def clear_all(self) -> None:
         """Clear all job data (useful for testing)"""
+        empty = {
+            "jobs": [],
+            "metadata": {
+                "total_count": 0,
+                "cached_at": datetime.now().isoformat(),
+                "companies": {}
+            }
+        }
         try:
-            self._write_data({
-                "jobs": [],
-                "metadata": {
-                    "total_count": 0,
-                    "cached_at": datetime.now().isoformat(),
-                    "companies": {}
-                }
-            })
+            async with self._write_lock:
+                await asyncio.to_thread(self._write_data, empty)
             logger.info("Cleared all data")
         except Exception as e:
             logger.error(f"Error clearing data: {e}")
@@ -1,10 +1,13 @@
 import asyncio
-from datetime import datetime
+import itertools
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Type, Union
+from zoneinfo import ZoneInfo
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import pytz
-from utils.logger import setup_logger
+from utils.logger import LOG_SEPARATOR, setup_logger
 from services.file_storage_service import file_storage
+from scrapers.base_scraper import BaseScraper, DriverPool
 from scrapers.posthog_scraper import PostHogScraper
 from scrapers.kraken_scraper import KrakenScraper
 from scrapers.coinbase_scraper import CoinbaseScraper
@@ -13,6 +16,9 @@ from scrapers.airbnb_scraper import AirbnbScraper
 
 logger = setup_logger(__name__)
 
+# On startup, scrape right away if the last run finished longer ago than this
+CATCH_UP_AFTER = timedelta(hours=23)
+
 
 # Company scrapers registry
 SCRAPERS = {
@@ -24,7 +30,7 @@ SCRAPERS = {
 }
 
 
-async def scrape_all_jobs():
+async def scrape_all_jobs(force_rescrape: bool = False):
     """
     Main scraping orchestrator - scrapes all companies in parallel
 
@@ -32,11 +38,15 @@ async def scrape_all_jobs():
     - Parallel scraping (all companies simultaneously)
     - Distributed lock to prevent concurrent runs
     - Partial failure handling (one company failing doesn't affect others)
-    - Cache updates per company
+    - Results of every company stored in a single write at the end
+    - Detail pages scraped recently are reused unless force_rescrape is set
+
+    Args:
+        force_rescrape: Visit every detail page even if a fresh result is stored
     """
-    logger.info("=" * 60)
+    logger.info(LOG_SEPARATOR)
     logger.info("Starting scheduled job scraping")
-    logger.info("=" * 60)
+    logger.info(LOG_SEPARATOR)
 
     # Acquire distributed lock
     lock_acquired = await file_storage.acquire_scrape_lock()
@@ -44,97 +54,123 @@ async def scrape_all_jobs():
         logger.warning("Scrape already in progress, skipping this run")
         return
 
+    # Browsers are shared across companies for this run and closed at the end;
+    # sized so every detail page slot's driver can be handed to the next scraper
+    driver_pool = DriverPool(max_idle=BaseScraper.MAX_CONCURRENT_PAGES)
+
     try:
         start_time = datetime.now()
-        all_jobs = []
+        company_jobs = []
         company_metadata = {}
 
-        # Create scraping tasks for all companies (parallel execution)
-        scraping_tasks = []
-        for company_name, scraper_class in SCRAPERS.items():
-            scraping_tasks.append(scrape_company(company_name, scraper_class))
+        # Scrape all companies in parallel; a company's failure is recorded
+        # as its result, while cancelling the run cancels every scraper
+        results: Dict[str, Union[List[Dict], Exception]] = {}
 
-        # Execute all scraping tasks in parallel
-        results = await asyncio.gather(*scraping_tasks, return_exceptions=True)
+        async def run(company_name: str, scraper_class: Type[BaseScraper]) -> None:
+            try:
+                results[company_name] = await scrape_company(company_name, scraper_class, driver_pool, force_rescrape)
+            except Exception as e:
+                results[company_name] = e
+
+        async with asyncio.TaskGroup() as tg:
+            for company_name, scraper_class in SCRAPERS.items():
+                tg.create_task(run(company_name, scraper_class))
+
+        # One timestamp for every status and the metadata of this run
+        scraped_at = datetime.now().isoformat()
+
+        # Fetch the previous jobs of every failed company at once
+        failed = [name for name, result in results.items() if isinstance(result, Exception)]
+        previous_jobs = dict(zip(failed, await asyncio.gather(
+            *(file_storage.get_company_jobs(name) for name in failed)
+        )))
 
         # Process results
-        for company_name, result in zip(SCRAPERS.keys(), results):
+        for company_name in SCRAPERS:
+            result = results[company_name]
             if isinstance(result, Exception):
                 # Scraping failed for this company
                 logger.error(f"Failed to scrape {company_name}: {result}")
-                await file_storage.set_scrape_status(company_name, "failed", 0, str(result))
 
-                # Try to get old cached data for this company
-                old_jobs = await file_storage.get_company_jobs(company_name)
+                # Fall back to old cached data for this company
+                old_jobs = previous_jobs[company_name]
                 if old_jobs:
-                    all_jobs.extend(old_jobs)
+                    company_jobs.append(old_jobs)
                     logger.info(f"Using {len(old_jobs)} cached jobs from previous scrape for {company_name}")
 
                 company_metadata[company_name] = {
                     "count": len(old_jobs) if old_jobs else 0,
-                    "last_scraped": datetime.now().isoformat(),
+                    "last_scraped": scraped_at,
                     "status": "failed",
                     "error": str(result)
                 }
             else:
                 # Scraping succeeded
                 jobs = result
-                all_jobs.extend(jobs)
-
-                # Update storage for this company
-                await file_storage.set_company_jobs(company_name, jobs)
-                await file_storage.set_scrape_status(company_name, "success", len(jobs), None)
+                company_jobs.append(jobs)
 
                 company_metadata[company_name] = {
                     "count": len(jobs),
-                    "last_scraped": datetime.now().isoformat(),
+                    "last_scraped": scraped_at,
                     "status": "success",
                     "error": None
                 }
 
                 logger.info(f"Successfully scraped {len(jobs)} jobs from {company_name}")
 
-        # Update main storage with all jobs
-        await file_storage.set_all_jobs(all_jobs)
+        all_jobs = list(itertools.chain.from_iterable(company_jobs))
 
-        # Update metadata
+        # Store all jobs and metadata (per-company statuses included) at once
         metadata = {
             "total_count": len(all_jobs),
             "filtered_count": len(all_jobs),
-            "cached_at": datetime.now().isoformat(),
+            "cached_at": scraped_at,
             "companies": company_metadata
         }
-        await file_storage.set_metadata(metadata)
+        await file_storage.commit_scrape(all_jobs, metadata)
 
         # Log summary
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
-        logger.info("=" * 60)
+        logger.info(LOG_SEPARATOR)
         logger.info(f"Scraping complete in {duration:.2f}s")
         logger.info(f"Total jobs scraped: {len(all_jobs)}")
         logger.info(f"Companies succeeded: {sum(1 for m in company_metadata.values() if m['status'] == 'success')}/{len(SCRAPERS)}")
-        logger.info("=" * 60)
+        logger.info(LOG_SEPARATOR)
 
     except Exception as e:
         logger.error(f"Unexpected error during scraping: {e}")
     finally:
-        # Always release the lock
+        # Quit pooled browsers off the event loop, then release the lock
+        await asyncio.to_thread(driver_pool.close)
         await file_storage.release_scrape_lock()
 
 
-async def scrape_company(company_name: str, scraper_class) -> list:
+async def scrape_company(
+    company_name: str,
+    scraper_class,
+    driver_pool: DriverPool = None,
+    force_rescrape: bool = False,
+) -> list:
     """
     Scrape a single company
 
     Args:
         company_name: Company name
         scraper_class: Scraper class to instantiate
+        driver_pool: Browser pool shared with the other scrapers of this run
+        force_rescrape: Ignore previously stored jobs as a detail-page cache
 
     Returns:
         List of jobs (or raises exception on failure)
     """
     logger.info(f"Starting scrape for {company_name}")
-    scraper = scraper_class()
+    detail_cache = {}
+    if not force_rescrape:
+        previous = await file_storage.get_company_jobs(company_name) or []
+        detail_cache = {job["url"]: file_storage.public_job(job) for job in previous if job.get("url")}
+    scraper = scraper_class(driver_pool, detail_cache)
     jobs = await scraper.scrape_with_retry()
     logger.info(f"Completed scrape for {company_name}: {len(jobs)} jobs")
     return jobs
@@ -148,28 +184,49 @@ class SchedulerService:
     """
 
     def __init__(self):
-        self.scheduler = AsyncIOScheduler(timezone=pytz.timezone('America/Sao_Paulo'))
+        self.timezone = ZoneInfo('America/Sao_Paulo')
+        self.scheduler = AsyncIOScheduler(timezone=self.timezone)
+        self.trigger = CronTrigger(hour=6, minute=0, timezone=self.timezone)
         self.running = False
+        # Another worker process owns the scheduler (see start)
+        self.standby = False
+        self._catch_up_task: Optional[asyncio.Task] = None
+        # Next fire time as last read from the scheduler, and its ISO form
+        self._next_run: Optional[datetime] = None
+        self._next_run_iso: Optional[str] = None
 
     def start(self):
-        """Start the scheduler"""
+        """
+        Start the scheduler
+
+        Only one gunicorn worker runs it: the one holding the storage's
+        scheduler lock. The others stay on standby and only serve requests.
+        """
         if self.running:
             logger.warning("Scheduler already running")
             return
 
+        if not file_storage.acquire_scheduler_lock():
+            self.standby = True
+            logger.info("Scheduler runs in another worker, this one stays on standby")
+            return
+
         # Schedule daily job at 6:00 AM Brazil time
         self.scheduler.add_job(
             scrape_all_jobs,
-            trigger=CronTrigger(hour=6, minute=0),
+            trigger=self.trigger,
             id='daily_job_scrape',
             name='Daily Job Scraping',
             replace_existing=True,
             max_instances=1,  # Prevent concurrent runs
-            misfire_grace_time=3600  # If missed, run within 1 hour
+            # Only absorb event-loop delays; runs missed while the app was
+            # down are handled by the startup catch-up check instead
+            misfire_grace_time=60
         )
 
         self.scheduler.start()
         self.running = True
+        self._catch_up_task = asyncio.create_task(self._catch_up_if_stale())
 
         logger.info("Scheduler started successfully")
         logger.info("Next scheduled run: 6:00 AM Brazil time (America/Sao_Paulo)")
@@ -178,25 +235,51 @@ class SchedulerService:
         next_run = self.scheduler.get_job('daily_job_scrape').next_run_time
         logger.info(f"Next run at: {next_run}")
 
+    async def _catch_up_if_stale(self) -> None:
+        """Scrape now if the stored data is older than CATCH_UP_AFTER"""
+        try:
+            metadata = await file_storage.get_metadata()
+            if not metadata.get("companies"):
+                # Never scraped: leave the first run to the schedule or a manual trigger
+                return
+            age = datetime.now() - datetime.fromisoformat(metadata["cached_at"])
+            if age <= CATCH_UP_AFTER:
+                return
+            logger.info(f"Stored jobs are {age} old, running a catch-up scrape")
+            await scrape_all_jobs()
+        except Exception as e:
+            logger.error(f"Catch-up scrape check failed: {e}")
+
     def stop(self):
         """Stop the scheduler"""
+        if self._catch_up_task and not self._catch_up_task.done():
+            self._catch_up_task.cancel()
         if self.scheduler.running:
             self.scheduler.shutdown(wait=True)
             self.running = False
             logger.info("Scheduler stopped")
 
     def get_status(self) -> dict:
-        """Get scheduler status"""
-        if not self.running:
+        """
+        Get scheduler status
+
+        Standby workers report the schedule the owning worker runs.
+
+        The next run time only changes when the job fires, so it is read
+        from the scheduler again only once the cached time has passed.
+        """
+        if not self.running and not self.standby:
             return {"running": False, "next_run": None}
 
-        job = self.scheduler.get_job('daily_job_scrape')
-        if job:
-            return {
-                "running": True,
-                "next_run": job.next_run_time.isoformat() if job.next_run_time else None
-            }
-        return {"running": self.running, "next_run": None}
+        if self._next_run is None or self._next_run <= datetime.now(self._next_run.tzinfo):
+            if self.standby:
+                # The owning worker fires on the same trigger
+                self._next_run = self.trigger.get_next_fire_time(None, datetime.now(self.timezone))
+            else:
+                job = self.scheduler.get_job('daily_job_scrape')
+                self._next_run = job.next_run_time if job else None
+            self._next_run_iso = self._next_run.isoformat() if self._next_run else None
+        return {"running": True, "next_run": self._next_run_iso}
 
 
 # Singleton instance
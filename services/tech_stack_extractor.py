@@ -1,11 +1,82 @@
 import re
-from typing import List, Set
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Pattern, Set, Tuple
+
+
+# Every technology name contains a letter
+LETTER_RE = re.compile(r"[A-Za-z]")
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation of `words` factored into a prefix trie
+
+    Each branch point lists distinct next characters, so the regex engine
+    follows one path per starting position instead of trying every word;
+    optional tails are greedy, so the longest word is tried first.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+def _compile_matcher(words: Iterable[str], bounded: bool) -> Pattern:
+    """
+    Compile one pattern finding every word in a single pass
+
+    With `bounded`, each word keeps `\b...\b` semantics. The match sits
+    inside a lookahead, so it consumes nothing and overlapping words (e.g.
+    "ruby on rails" and "rails") are all found; group 1 is the longest word
+    starting at each position.
+    """
+    boundary = r"\b" if bounded else ""
+    return re.compile(r"(?=" + boundary + "(" + _trie_regex(words) + ")" + boundary + ")")
+
+
+def _prefix_words(words: Iterable[str]) -> Dict[str, List[Tuple[str, Pattern]]]:
+    """
+    Map each word to the shorter words it starts with
+
+    The single-pass matcher only reports the longest word at a position
+    ("spring boot"), so the shorter ones there ("spring") are re-checked
+    with their own `\b...\b` pattern.
+    """
+    words = list(words)
+    patterns = {w: re.compile(r"\b" + re.escape(w) + r"\b") for w in words}
+    return {
+        word: [(other, patterns[other]) for other in words if other != word and word.startswith(other)]
+        for word in words
+    }
+
+
+def _names_by_word(techs: Iterable[str], aliases: Dict[str, str]) -> Dict[str, Tuple[str, ...]]:
+    """Map each lowercase word to the technologies it reports"""
+    names: Dict[str, Tuple[str, ...]] = {tech.lower(): (tech,) for tech in techs}
+    for word, tech in aliases.items():
+        names[word] = names.get(word, ()) + (tech,)
+    return names
+
 
 class TechStackExtractor:
     """Extract technology stack from job descriptions using pattern matching"""
 
-    # Comprehensive technology keywords (case-sensitive for accuracy)
-    TECHNOLOGIES = {
+    # Comprehensive technology keywords (case-sensitive for accuracy); frozen
+    # because the matchers below are compiled from it once at import
+    TECHNOLOGIES = frozenset({
         # Programming Languages
         "Python", "JavaScript", "TypeScript", "Go", "Golang", "Rust", "Java",
         "Kotlin", "Swift", "C++", "C#", "Ruby", "PHP", "Scala", "Elixir",
@@ -53,72 +124,104 @@ class TechStackExtractor:
         # Other Tools
         "Git", "GitHub", "GitLab", "Bitbucket", "Jira", "Confluence",
         "Nginx", "Apache", "Linux", "Unix", "Bash", "Shell"
+    })
+
+    # Variations reported as another technology: whole words...
+    WORD_ALIASES = {
+        "node": "Node.js",
+        "go": "Go",
+        "vue": "Vue.js",
+        "express": "Express.js",
+        # AWS service names only count as whole words: as substrings they hit
+        # ordinary words ("standards", "records" -> rds)
+        "s3": "AWS", "ec2": "AWS", "lambda": "AWS", "rds": "AWS", "sqs": "AWS", "sns": "AWS",
+        "google cloud": "GCP",
+    }
+    # ...and substrings found anywhere in the text
+    SUBSTRING_ALIASES = {
+        "node.js": "Node.js", "nodejs": "Node.js",
+        "postgres": "PostgreSQL",
+        "golang": "Go",
+        "vue.js": "Vue.js",
+        "next.js": "Next.js", "nextjs": "Next.js",
+        "express.js": "Express.js",
+        ".net": ".NET", "dotnet": ".NET",
     }
 
+    # Compiled once at import: matching is one regex pass per text for the
+    # technologies (plus word aliases) and one for the substring aliases
+    _NAMES = _names_by_word(TECHNOLOGIES, WORD_ALIASES)
+    _MATCHER = _compile_matcher(_NAMES, bounded=True)
+    _PREFIXES = _prefix_words(_NAMES)
+    _VARIATIONS_MATCHER = _compile_matcher(SUBSTRING_ALIASES, bounded=False)
+
+    # Results for recently seen texts, keyed by a digest of the text so the
+    # cache doesn't hold multi-KB descriptions; shared by scraper threads
+    CACHE_SIZE = 4096
+    _cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
     @classmethod
     def extract(cls, text: str) -> List[str]:
         """
         Extract technology stack from text (job description, requirements, etc.)
 
+        Repeated texts (the same posting seen again, shared boilerplate) are
+        answered from an LRU cache instead of being scanned again.
+
         Args:
             text: Job description or requirements text
 
         Returns:
             Sorted list of detected technologies
         """
-        if not text:
+        # Whitespace, numbers and punctuation-only fields can't name anything;
+        # one C-level scan skips hashing and the cache for them
+        if not text or not LETTER_RE.search(text):
             return []
 
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with cls._cache_lock:
+            cached = cls._cache.get(key)
+            if cached is not None:
+                cls._cache.move_to_end(key)
+                return list(cached)
+
+        techs = cls._scan(text)
+        with cls._cache_lock:
+            cls._cache[key] = techs
+            if len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return list(techs)
+
+    @classmethod
+    def _scan(cls, text: str) -> Tuple[str, ...]:
+        """Match every technology in `text` (uncached)"""
         found_techs: Set[str] = set()
         text_lower = text.lower()
 
-        for tech in cls.TECHNOLOGIES:
-            # Case-insensitive search with word boundaries
-            pattern = r'\b' + re.escape(tech.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_techs.add(tech)
+        # Case-insensitive search with word boundaries, all technologies at once
+        for match in cls._MATCHER.finditer(text_lower):
+            word = match.group(1)
+            found_techs.update(cls._NAMES[word])
+            for shorter, pattern in cls._PREFIXES[word]:
+                if pattern.match(text_lower, match.start()):
+                    found_techs.update(cls._NAMES[shorter])
 
         # Special handling for common variations
         cls._handle_variations(text_lower, found_techs)
 
-        return sorted(list(found_techs))
+        return tuple(sorted(found_techs))
 
     @classmethod
     def _handle_variations(cls, text_lower: str, found_techs: Set[str]) -> None:
-        """Handle special cases and variations in technology names"""
-
-        # Node.js variations
-        if "node.js" in text_lower or "nodejs" in text_lower or re.search(r'\bnode\b', text_lower):
-            found_techs.add("Node.js")
-
-        # PostgreSQL variations
-        if "postgresql" in text_lower or "postgres" in text_lower:
-            found_techs.add("PostgreSQL")
-
-        # Go/Golang
-        if "golang" in text_lower or re.search(r'\bgo\b', text_lower):
-            found_techs.add("Go")
-
-        # Vue.js variations
-        if "vue.js" in text_lower or re.search(r'\bvue\b', text_lower):
-            found_techs.add("Vue.js")
-
-        # Next.js variations
-        if "next.js" in text_lower or "nextjs" in text_lower:
-            found_techs.add("Next.js")
-
-        # Express.js variations
-        if "express.js" in text_lower or re.search(r'\bexpress\b', text_lower):
-            found_techs.add("Express.js")
-
-        # .NET variations
-        if ".net" in text_lower or "dotnet" in text_lower:
-            found_techs.add(".NET")
-
-        # AWS services
-        if any(svc in text_lower for svc in ["s3", "ec2", "lambda", "rds", "sqs", "sns"]):
-            found_techs.add("AWS")
+        """
+        Handle special cases and variations in technology names
 
-        # Google Cloud variations
-        if "google cloud" in text_lower or "gcp" in text_lower:
-            found_techs.add("GCP")
+        Whole-word variations are matched with the technologies; this adds
+        the ones that count anywhere in the text (SUBSTRING_ALIASES). Aliases
+        sharing a start position ("postgres"/"postgresql") map to the same
+        technology, so the longest match per position is enough.
+        """
+        for match in cls._VARIATIONS_MATCHER.finditer(text_lower):
+            found_techs.add(cls.SUBSTRING_ALIASES[match.group(1)])
@@ -1,24 +1,19 @@
 import logging
 import sys
+from functools import lru_cache
 
-def setup_logger(name: str) -> logging.Logger:
-    """
-    Configure and return a logger with console output
+# Banner line around startup/shutdown and scrape-run summaries
+LOG_SEPARATOR = "=" * 60
 
-    Args:
-        name: Logger name (typically __name__ of calling module)
 
-    Returns:
-        Configured logger instance
+@lru_cache(maxsize=None)
+def _console_handler() -> logging.Handler:
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-
-    # Avoid duplicate handlers if logger already configured
-    if logger.handlers:
-        return logger
+    Build the stdout handler shared by every logger (created on first use)
 
-    # Console handler
+    One handler means one formatter and one I/O lock for all modules,
+    instead of a handler per logger writing to the same stream.
+    """
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(logging.INFO)
 
@@ -28,6 +23,30 @@ def setup_logger(name: str) -> logging.Logger:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     handler.setFormatter(formatter)
+    return handler
+
+
+@lru_cache(maxsize=None)
+def setup_logger(name: str) -> logging.Logger:
+    """
+    Configure and return a logger with console output
+
+    Memoized: repeated calls for the same name return the configured
+    logger without touching its level or handlers again.
+
+    Args:
+        name: Logger name (typically __name__ of calling module)
 
-    logger.addHandler(handler)
+    Returns:
+        Configured logger instance
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    # Records are written by the shared handler only, not again by any
+    # handler a server configures on the root logger
+    logger.propagate = False
+
+    # Avoid duplicate handlers if logger already configured
+    if not logger.handlers:
+        logger.addHandler(_console_handler())
     return logger